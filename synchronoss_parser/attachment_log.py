@@ -7,28 +7,32 @@ are written to an Excel workbook and an accompanying HTML table with
 thumbnails of image attachments.
 
 Usage:
-    attachment-log [--messages DIR] [--out DIR]
-    python -m synchronoss_parser.attachment_log [--messages DIR] [--out DIR]
+    attachment-log [--messages DIR] [--out DIR] [--gzip]
+    python -m synchronoss_parser.attachment_log [--messages DIR] [--out DIR] [--gzip]
 
 By default it expects a ``messages`` folder in the current working
-directory and writes outputs under ``Attachment Log``.
+directory and writes outputs under ``Attachment Log``. With ``--gzip``
+the HTML table is written as ``attachment_log.html.gz`` instead, which is
+far smaller for large runs but must be served with ``Content-Encoding:
+gzip`` (or decompressed) to be viewed in a browser.
 """
 
 import argparse
-import csv
 import html
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from openpyxl import Workbook
 from PIL import Image
 
 from .render_transcripts import (
-    Message,
-    build_attachment_path,
+    attachment_dir_builder,
     derive_attachment_day_from_csv_name,
+    open_html_output,
+    read_csv_columns,
     split_attachments,
 )
 
@@ -41,26 +45,18 @@ def collect_attachments(messages_root: Path) -> List[AttachmentEntry]:
     entries: List[AttachmentEntry] = []
     for csv_file in sorted(messages_root.glob("*.csv")):
         day = derive_attachment_day_from_csv_name(csv_file) or ""
-        with csv_file.open("r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                attachments = split_attachments(row.get("Attachments") or "")
-                if not attachments:
-                    continue
-                msg = Message(
-                    date_raw=row.get("Date") or "",
-                    date_dt=None,
-                    msg_type=(row.get("Type") or "").strip().lower(),
-                    direction=(row.get("Direction") or "").strip().lower(),
-                    attachments=attachments,
-                    body=row.get("Body") or "",
-                    sender=row.get("Sender") or "",
-                    recipients=row.get("Recipients") or "",
-                    message_id=row.get("Message ID") or "",
-                    attachment_day=day,
-                )
-                for fname in attachments:
-                    entries.append((fname, msg.sender, msg.recipients, msg.msg_type, msg.direction, day))
+        rows = read_csv_columns(
+            csv_file, ("Attachments", "Sender", "Recipients", "Type", "Direction")
+        )
+        for attachments_field, sender, recipients, msg_type, direction in rows:
+            attachments = split_attachments(attachments_field)
+            if not attachments:
+                continue
+            msg_type = msg_type.strip().lower()
+            direction = direction.strip().lower()
+            entries.extend(
+                (fname, sender, recipients, msg_type, direction, day) for fname in attachments
+            )
     return entries
 
 
@@ -80,45 +76,77 @@ def create_thumbnail(src: Path, dest: Path, size: Tuple[int, int] = (128, 128))
         return False
 
 
-def generate_log(messages_root: Path, out_dir: Path) -> None:
+def generate_log(messages_root: Path, out_dir: Path, gzip_output: bool = False) -> None:
     entries = collect_attachments(messages_root)
     out_dir.mkdir(parents=True, exist_ok=True)
     thumb_dir = out_dir / "thumbnails"
     thumb_dir.mkdir(parents=True, exist_ok=True)
 
-    wb = Workbook()
-    ws = wb.active
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
     ws.append(["filename", "sender", "recipient"])
 
+    attachment_dir = attachment_dir_builder(messages_root)
+    paths = [
+        (
+            attachment_dir(msg_type, direction, day) / fname,
+            thumb_dir / msg_type / direction / day / fname,
+        )
+        for fname, _, _, msg_type, direction, day in entries
+    ]
+
+    # Thumbnails are decoded in worker threads (Pillow releases the GIL while
+    # decoding). Each distinct thumbnail is made once so no two workers write
+    # the same file; the workbook is only touched from this thread.
+    jobs = {thumb_path: attach_path for attach_path, thumb_path in paths}
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        made = dict(zip(jobs, executor.map(create_thumbnail, jobs.values(), jobs)))
+
     html_rows = []
-    for fname, sender, recipient, msg_type, direction, day in entries:
+    for (fname, sender, recipient, *_), (attach_path, thumb_path) in zip(entries, paths):
         ws.append([fname, sender, recipient])
-        attach_path = build_attachment_path(messages_root, msg_type, direction, day, fname)
-        thumb_path = thumb_dir / msg_type / direction / day / fname
-        if not create_thumbnail(attach_path, thumb_path):
+        if not made[thumb_path]:
             logging.warning("Failed to create thumbnail for %s", attach_path)
             thumb_path = None
         html_rows.append((fname, sender, recipient, attach_path, thumb_path))
 
     wb.save(out_dir / "attachment_log.xlsx")
 
-    html_file = out_dir / "attachment_log.html"
-    with html_file.open("w", encoding="utf-8") as f:
+    rel_dirs: Dict[Path, str] = {}
+    out_prefix = str(out_dir) + os.sep
+
+    def rel_link(path: Path) -> str:
+        # Attachments and thumbnails share a handful of folders, so the
+        # relative folder path is computed once per directory. Folders under
+        # ``out_dir`` (the thumbnails) only need their prefix trimmed.
+        parent = rel_dirs.get(path.parent)
+        if parent is None:
+            parent_str = str(path.parent)
+            if parent_str.startswith(out_prefix):
+                parent = parent_str[len(out_prefix):]
+            else:
+                parent = os.path.relpath(parent_str, start=out_dir)
+            parent = parent.replace(os.sep, "/")
+            rel_dirs[path.parent] = parent
+        return path.name if parent == "." else f"{parent}/{path.name}"
+
+    rows: List[str] = []
+    for fname, sender, recipient, attach_path, thumb_path in html_rows:
+        if thumb_path and thumb_path.exists():
+            thumb_cell = f'<td><img src="{rel_link(thumb_path)}" /></td>'
+        else:
+            thumb_cell = "<td></td>"
+        rows.append(
+            f'<tr><td><a href="{rel_link(attach_path)}">{html.escape(fname)}</a></td>'
+            f"<td>{html.escape(sender)}</td><td>{html.escape(recipient)}</td>"
+            f"{thumb_cell}</tr>\n"
+        )
+
+    html_name = "attachment_log.html.gz" if gzip_output else "attachment_log.html"
+    with open_html_output(out_dir / html_name) as f:
         f.write("<table>\n")
         f.write("<tr><th>filename</th><th>sender</th><th>recipient</th><th>thumbnail</th></tr>\n")
-        for fname, sender, recipient, attach_path, thumb_path in html_rows:
-            link = html.escape(fname)
-            rel = os.path.relpath(attach_path, start=out_dir).replace(os.sep, "/")
-            f.write("<tr>")
-            f.write(f'<td><a href="{rel}">{link}</a></td>')
-            f.write(f"<td>{html.escape(sender)}</td>")
-            f.write(f"<td>{html.escape(recipient)}</td>")
-            if thumb_path and thumb_path.exists():
-                rel_thumb = os.path.relpath(thumb_path, start=out_dir).replace(os.sep, "/")
-                f.write(f'<td><img src="{rel_thumb}" /></td>')
-            else:
-                f.write("<td></td>")
-            f.write("</tr>\n")
+        f.writelines(rows)
         f.write("</table>\n")
 
 
@@ -126,8 +154,13 @@ def main() -> None:
     ap = argparse.ArgumentParser(description="Generate attachment log")
     ap.add_argument("--messages", default="messages", help="Folder containing message CSVs")
     ap.add_argument("--out", default="Attachment Log", help="Output folder")
+    ap.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Write the HTML table gzip-compressed as attachment_log.html.gz",
+    )
     args = ap.parse_args()
-    generate_log(Path(args.messages), Path(args.out))
+    generate_log(Path(args.messages), Path(args.out), gzip_output=args.gzip)
 
 
 if __name__ == "__main__":
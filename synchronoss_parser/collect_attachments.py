@@ -15,20 +15,23 @@ from ``render_transcripts``.
 
 from __future__ import annotations
 
-import csv
+import functools
+import os
 import re
-import shutil
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 from openpyxl import Workbook
 
-from .collect_media import md5sum, extract_exif, ensure_unique_name
+from .collect_media import copy_and_md5, ensure_unique_name, existing_names, extract_exif, iter_files
 from .render_transcripts import (
-    build_attachment_path,
+    attachment_dir_builder,
     build_contact_lookup,
     derive_attachment_day_from_csv_name,
     parse_csv_date,
+    read_csv_columns,
     split_attachments,
 )
 
@@ -39,14 +42,37 @@ DEFAULT_ATTACHMENTS_ROOT = Path("messages") / "attachments"
 DEFAULT_COMPILED = Path("Compiled Attachments")
 DEFAULT_LOGFILE = DEFAULT_COMPILED / "compiled_attachment_log" / "compiled_attachment_log.xlsx"
 
+# Recipients are separated by semicolons or commas
+_RECIPIENT_SEP_RE = re.compile(r"[;,]")
+
+# Characters removed by sanitize_filename_component: control codes and
+# those Windows forbids in file names
+_UNSAFE_FILENAME_CHARS = str.maketrans(
+    "", "", "".join(map(chr, range(0x20))) + '<>:"/\\|?*'
+)
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 def sanitize_filename_component(text: str) -> str:
     """Return ``text`` stripped of common filesystem-unsafe characters."""
-    cleaned = re.sub(r'[<>:"/\\|?*\x00-\x1F]', "", text)
-    return cleaned.strip().rstrip(".")
+    return text.translate(_UNSAFE_FILENAME_CHARS).strip().rstrip(".")
+
+
+def _index_key_builder() -> Callable[[Path, str], str]:
+    """Return a function giving the metadata index key for a file.
+
+    The function takes the file's ``directory`` and ``name``. Files share a
+    handful of folders, so each folder is resolved once and cached for as
+    long as the returned function lives: one scan, not the whole process.
+    """
+    resolve_dir = functools.lru_cache(maxsize=None)(lambda directory: str(directory.resolve()))
+
+    def index_key(directory: Path, name: str) -> str:
+        return os.path.join(resolve_dir(directory), name)
+
+    return index_key
 
 # ---------------------------------------------------------------------------
 # Helper to map attachment files to message metadata
@@ -54,70 +80,85 @@ def sanitize_filename_component(text: str) -> str:
 
 def build_metadata_index(
     messages_root: Path, contact_lookup: Callable[[str], str] = lambda x: x
-) -> Dict[Path, Dict[str, str]]:
-    """Scan message CSV files and map attachment paths to metadata."""
-    index: Dict[Path, Dict[str, str]] = {}
+) -> Dict[str, Dict[str, str]]:
+    """Scan message CSV files and map attachment paths to metadata.
+
+    Keys are resolved attachment paths as strings.
+    """
+    index: Dict[str, Dict[str, str]] = {}
+    # The same handful of numbers recur on thousands of rows
+    contact_lookup = functools.lru_cache(maxsize=4096)(contact_lookup)
+    attachment_dir = attachment_dir_builder(messages_root)
+    index_key = _index_key_builder()
     for csv_file in sorted(messages_root.glob("*.csv")):
         day = derive_attachment_day_from_csv_name(csv_file)
-        with csv_file.open("r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                attachments = split_attachments(row.get("Attachments") or "")
-                if not attachments:
-                    continue
-                msg_type = (row.get("Type") or "").strip().lower()
-                direction = (row.get("Direction") or "").strip().lower()
-                date = (row.get("Date") or "").strip()
-                sender = contact_lookup((row.get("Sender") or "").strip())
-
-                raw_recip = (row.get("Recipients") or "")
-                recip_parts: List[str] = []
-                for part in raw_recip.replace(",", ";").split(";"):
-                    p = part.strip()
-                    if p:
-                        recip_parts.append(contact_lookup(p))
-                recipient = "; ".join(recip_parts)
-
-                for fname in attachments:
-                    path = build_attachment_path(
-                        messages_root, msg_type, direction, day or "", fname
-                    )
-                    index[path.resolve()] = {
-                        "Date": date,
-                        "Sender": sender,
-                        "Recipient": recipient,
-                    }
+        rows = read_csv_columns(
+            csv_file, ("Attachments", "Type", "Direction", "Date", "Sender", "Recipients")
+        )
+        for attachments_field, msg_type, direction, date, sender, raw_recip in rows:
+            attachments = split_attachments(attachments_field)
+            if not attachments:
+                continue
+            msg_type = msg_type.strip().lower()
+            direction = direction.strip().lower()
+            date = date.strip()
+            sender = contact_lookup(sender.strip())
+
+            parts = (part.strip() for part in _RECIPIENT_SEP_RE.split(raw_recip))
+            recipient = "; ".join(map(contact_lookup, filter(None, parts)))
+
+            folder = attachment_dir(msg_type, direction, day or "")
+            meta = {"Date": date, "Sender": sender, "Recipient": recipient}
+            for fname in attachments:
+                index[index_key(folder, fname)] = meta
     return index
 
 # ---------------------------------------------------------------------------
 # Main processing
 # ---------------------------------------------------------------------------
 
-def collect_attachments(
+def _prepare(
     attachments_root: Path,
     compiled_path: Path,
-    contacts_xlsx: str | Path | None = None,
-) -> Tuple[List[Dict[str, str]], List[str]]:
-    """Copy attachments from ``attachments_root`` into ``compiled_path``.
-
-    Returns a tuple ``(records, exif_keys)`` where ``records`` is a list of
-    metadata dictionaries and ``exif_keys`` is the sorted list of all EXIF
-    keys encountered.
-    """
+    contacts_xlsx: str | Path | None,
+) -> Tuple[List[Path], Dict[str, Dict[str, str]]]:
+    """Create ``compiled_path`` and return the attachment files and metadata index."""
     compiled_path.mkdir(exist_ok=True)
 
     messages_root = attachments_root.parent
     lookup = build_contact_lookup(str(contacts_xlsx) if contacts_xlsx else None)
     metadata_index = build_metadata_index(messages_root, lookup)
 
-    records: List[Dict[str, str]] = []
-    exif_keys: set[str] = set()
+    # DirEntry.is_file() answers from the directory listing, not a stat
+    files = [Path(entry.path) for entry in iter_files(attachments_root) if entry.is_file()]
+    return files, metadata_index
+
 
-    for file in attachments_root.rglob("*"):
-        if not file.is_file():
-            continue
+def _copy_and_read(file: Path, dest: Path) -> Tuple[Dict[str, str], str]:
+    """Return the EXIF data of ``file`` and the MD5 of its copy at ``dest``."""
+    return extract_exif(file), copy_and_md5(file, dest)
 
-        meta = metadata_index.get(file.resolve(), {})
+
+def _iter_records(
+    files: List[Path],
+    compiled_path: Path,
+    metadata_index: Dict[str, Dict[str, str]],
+    exif_keys: set[str],
+    exifs: Dict[Path, Dict[str, str]] | None = None,
+) -> Iterator[Dict[str, str]]:
+    """Copy ``files`` into ``compiled_path`` yielding one record per file.
+
+    EXIF keys seen are added to ``exif_keys`` as records are produced. When
+    ``exifs`` already maps each file to its EXIF data, it is used (and
+    emptied) instead of reading the files again.
+    """
+    taken = existing_names(compiled_path)
+    # Destination names depend on the order files are seen, so settle them
+    # all here before any copying starts
+    planned = []
+    index_key = _index_key_builder()
+    for file in files:
+        meta = metadata_index.get(index_key(file.parent, file.name), {})
 
         sender = sanitize_filename_component(meta.get("Sender", "")) or "unknown"
         date_raw = meta.get("Date", "")
@@ -128,24 +169,72 @@ def collect_attachments(
             formatted_date = sanitize_filename_component(date_raw.replace(":", "-")) or "unknown-date"
 
         dest_name = f"{sender} - {formatted_date}{file.suffix}"
-        dest = ensure_unique_name(compiled_path, dest_name)
-        shutil.copy2(file, dest)
-
-        exif = extract_exif(file)
-        exif_keys.update(exif.keys())
-
-        record = {
-            "File Name": dest.name,
-            "Date": date_raw,
-            "Sender": meta.get("Sender", ""),
-            "Recipient": meta.get("Recipient", ""),
-            "MD5": md5sum(file),
-        }
-        record.update(exif)
-        records.append(record)
+        planned.append((meta, date_raw, ensure_unique_name(compiled_path, dest_name, taken)))
+
+    # EXIF decoding, reading, hashing and writing all release the GIL, so
+    # each file is handled entirely in a worker; map() keeps the order
+    with ThreadPoolExecutor() as executor:
+        dests = [dest for _, _, dest in planned]
+        if exifs is None:
+            results = executor.map(_copy_and_read, files, dests)
+        else:
+            results = zip(map(exifs.pop, files), executor.map(copy_and_md5, files, dests))
+
+        for (meta, date_raw, dest), (exif, digest) in zip(planned, results):
+            exif_keys.update(exif.keys())
+
+            record = {
+                "File Name": dest.name,
+                "Date": date_raw,
+                "Sender": meta.get("Sender", ""),
+                "Recipient": meta.get("Recipient", ""),
+                "MD5": digest,
+            }
+            record.update(exif)
+            yield record
+
+
+def collect_attachments(
+    attachments_root: Path,
+    compiled_path: Path,
+    contacts_xlsx: str | Path | None = None,
+) -> Tuple[List[Dict[str, str]], List[str]]:
+    """Copy attachments from ``attachments_root`` into ``compiled_path``.
 
+    Returns a tuple ``(records, exif_keys)`` where ``records`` is a list of
+    metadata dictionaries and ``exif_keys`` is the sorted list of all EXIF
+    keys encountered.
+    """
+    files, metadata_index = _prepare(attachments_root, compiled_path, contacts_xlsx)
+    exif_keys: set[str] = set()
+    records = list(_iter_records(files, compiled_path, metadata_index, exif_keys))
     return records, sorted(exif_keys)
 
+
+def collect_and_log(
+    attachments_root: Path,
+    compiled_path: Path,
+    contacts_xlsx: str | Path | None = None,
+    logfile: Path | None = None,
+) -> int:
+    """Copy attachments and stream their metadata straight into ``logfile``.
+
+    Equivalent to :func:`collect_attachments` followed by :func:`write_excel`
+    without holding every record in memory. A first pass reads only the EXIF
+    headers to settle the spreadsheet columns and keeps them for the records;
+    each record is then written as soon as its file has been copied. Returns
+    the number of files copied.
+    """
+    files, metadata_index = _prepare(attachments_root, compiled_path, contacts_xlsx)
+
+    with ThreadPoolExecutor() as executor:
+        exifs = dict(zip(files, executor.map(extract_exif, files)))
+    exif_keys = set().union(*exifs.values())
+
+    records = _iter_records(files, compiled_path, metadata_index, set(), exifs)
+    write_excel(records, sorted(exif_keys), logfile)
+    return len(files)
+
 # ---------------------------------------------------------------------------
 # Excel logging
 # ---------------------------------------------------------------------------
@@ -154,16 +243,15 @@ def write_excel(records: Iterable[Dict[str, str]], exif_keys: Iterable[str], log
     logfile = logfile or DEFAULT_LOGFILE
     logfile.parent.mkdir(parents=True, exist_ok=True)
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Attachment Metadata"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Attachment Metadata")
 
     headers = ["File Name", "Date", "Sender", "Recipient", "MD5"] + list(exif_keys)
     ws.append(headers)
 
+    # One C-level map per row rather than a Python-level lookup per cell
     for rec in records:
-        row = [rec.get(h, "") for h in headers]
-        ws.append(row)
+        ws.append(tuple(map(rec.get, headers, repeat(""))))
 
     wb.save(logfile)
 
@@ -177,10 +265,9 @@ def main(attachments_root: Path | str = DEFAULT_ATTACHMENTS_ROOT, compiled_path:
     if not attachments_root.exists():
         raise SystemExit(f"Attachments folder '{attachments_root}' not found.")
 
-    records, exif_keys = collect_attachments(attachments_root, compiled_path, contacts_xlsx)
-    write_excel(records, exif_keys, logfile)
+    count = collect_and_log(attachments_root, compiled_path, contacts_xlsx, logfile)
     print(
-        f"Copied {len(records)} files from '{attachments_root}' to '{compiled_path}' and logged metadata to '{logfile or DEFAULT_LOGFILE}'."
+        f"Copied {count} files from '{attachments_root}' to '{compiled_path}' and logged metadata to '{logfile or DEFAULT_LOGFILE}'."
     )
 
 
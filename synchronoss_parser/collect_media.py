@@ -16,10 +16,15 @@ Outputs:
 
 from pathlib import Path
 import hashlib
+import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from fractions import Fraction
 from datetime import datetime
+from itertools import repeat
 import numbers
+from typing import Callable
 from PIL import Image, ExifTags
 from PIL.TiffImagePlugin import IFDRational
 from openpyxl import Workbook
@@ -35,15 +40,56 @@ LOGFILE = DEFAULT_LOGFILE
 # Media file extensions to search
 MEDIA_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp", ".mp4", ".mov"}
 
+# Image formats that can carry EXIF; other files are not opened with PIL
+EXIF_EXTS = {".jpg", ".jpeg", ".tif", ".tiff", ".png", ".webp"}
+
+# Read size used when hashing; large reads keep syscall counts low
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_file_digest = getattr(hashlib, "file_digest", None)
+
+# How many files collect_media copies between progress callbacks
+PROGRESS_EVERY = 25
+
 # -------------------------------------------------------------
 # Helper functions
 # -------------------------------------------------------------
-def md5sum(path: Path) -> str:
+def md5sum(path: str | Path) -> str:
     """Return MD5 hash of a file."""
+    with open(path, "rb", buffering=0) as f:
+        # Python 3.11+ hashes through a reusable buffer with no per-chunk
+        # bytes objects; older versions do the same by hand.
+        if _file_digest is not None:
+            return _file_digest(f, "md5").hexdigest()
+        h = hashlib.md5()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def copy_and_md5(src: str | Path, dest: Path) -> str:
+    """Copy ``src`` to ``dest`` and return the MD5 hash of the copied data.
+
+    The source is read once, each chunk being hashed and written from the
+    same buffer, instead of being read by the copy and again by
+    :func:`md5sum`. Metadata is copied afterwards as ``shutil.copy2`` would.
+    """
     h = hashlib.md5()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(src, "rb", buffering=0) as fsrc, open(dest, "wb") as fdst:
+        while True:
+            n = fsrc.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+            fdst.write(view[:n])
+    shutil.copystat(src, dest)
     return h.hexdigest()
 
 
@@ -69,11 +115,13 @@ def normalize_exif_value(value):
         return float(value)
     return str(value)
 
-def extract_exif(path: Path) -> dict:
+def extract_exif(path: str | Path) -> dict:
     """
     Extract EXIF data from an image (if any).
     Returns dict with human-readable keys; empty dict if none or file not image.
     """
+    if os.path.splitext(path)[1].lower() not in EXIF_EXTS:
+        return {}
     try:
         with Image.open(path) as img:
             raw = {ExifTags.TAGS.get(k, k): v for k, v in img.getexif().items()}
@@ -81,27 +129,126 @@ def extract_exif(path: Path) -> dict:
     except Exception:
         return {}
 
-def ensure_unique_name(target_dir: Path, filename: str) -> Path:
-    """Ensure unique filename inside target_dir to avoid overwrites."""
+def iter_files(root: str | Path):
+    """Yield ``os.DirEntry`` objects for every non-directory below ``root``.
+
+    Directories are walked with ``os.scandir`` so entries can be filtered by
+    name before any extra ``stat`` call is made. Symlinked folders are not
+    followed, matching ``Path.rglob``.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield entry
+
+def iter_media(root: str | Path):
+    """Yield ``os.DirEntry`` objects for media files below ``root``."""
+    for entry in iter_files(root):
+        if os.path.splitext(entry.name)[1].lower() in MEDIA_EXTS:
+            yield entry
+
+def _name_key(name: str) -> str:
+    """Return the form of ``name`` that two clashing file names share."""
+    # Windows and macOS file systems are case-insensitive by default
+    if sys.platform in ("win32", "darwin"):
+        return name.casefold()
+    return name
+
+def existing_names(target_dir: Path) -> set[str]:
+    """Return the names in ``target_dir`` for use with :func:`ensure_unique_name`."""
+    return {_name_key(name) for name in os.listdir(target_dir)}
+
+def ensure_unique_name(
+    target_dir: Path, filename: str, taken: set[str] | None = None, max_path: int | None = None
+) -> Path:
+    """Ensure unique filename inside target_dir to avoid overwrites.
+
+    Callers placing many files into one folder can pass ``taken``, built
+    with :func:`existing_names`, to check candidates against it instead of
+    the file system; the chosen name is added to it. With ``max_path`` the
+    stem is trimmed so every candidate, counter included, fits that length.
+    """
     base = Path(filename).stem
     ext = Path(filename).suffix
+
+    def candidate_for(suffix: str) -> Path:
+        stem = base
+        if max_path is not None:
+            room = max_path - len(str(target_dir)) - 1 - len(suffix) - len(ext)
+            stem = base[: max(room, 1)]
+        return target_dir / f"{stem}{suffix}{ext}"
+
     counter = 0
-    candidate = target_dir / filename
-    while candidate.exists():
+    candidate = candidate_for("")
+    if taken is None:
+        while candidate.exists():
+            counter += 1
+            candidate = candidate_for(f"_{counter}")
+        return candidate
+    key = _name_key(candidate.name)
+    while key in taken:
         counter += 1
-        candidate = target_dir / f"{base}_{counter}{ext}"
+        candidate = candidate_for(f"_{counter}")
+        key = _name_key(candidate.name)
+    taken.add(key)
     return candidate
 
+def fast_copy(src: str | Path, dest: Path) -> Path:
+    """Copy ``src`` to ``dest`` keeping the data in the kernel where possible.
+
+    ``os.copy_file_range`` is tried first so filesystems that support it
+    (Btrfs, XFS) can share extents instead of duplicating bytes. Otherwise
+    ``shutil.copyfile`` is used, which relies on ``sendfile`` or the
+    platform's native copy call. File metadata is copied afterwards as
+    ``shutil.copy2`` would.
+    """
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+                in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+                size = os.fstat(in_fd).st_size
+                count = max(size, HASH_CHUNK_SIZE)
+                done = 0
+                while True:
+                    n = os.copy_file_range(in_fd, out_fd, count)
+                    if not n:
+                        break
+                    done += n
+            # Some filesystems (procfs-like or FUSE mounts) report EOF early;
+            # a short copy is redone in full rather than kept truncated
+            copied = done >= size
+        except OSError:
+            # Unsupported by the kernel or filesystem (e.g. EXDEV, ENOSYS)
+            copied = False
+    if not copied:
+        shutil.copyfile(src, dest)
+    shutil.copystat(src, dest)
+    return dest
+
 # -------------------------------------------------------------
 # Main processing
 # -------------------------------------------------------------
-def collect_media(root_path: Path, compiled_path: Path):
-    """Copy media from ``root_path`` into ``compiled_path`` collecting metadata."""
+def collect_media(
+    root_path: Path,
+    compiled_path: Path,
+    progress_cb: Callable[[int, int], None] | None = None,
+):
+    """Copy media from ``root_path`` into ``compiled_path`` collecting metadata.
+
+    ``progress_cb(done, total)`` is called every :data:`PROGRESS_EVERY` files
+    and once more when all files have been copied.
+    """
     compiled_path.mkdir(exist_ok=True)
 
     records = []
     exif_keys = set()
 
+    sources = []
     for date_dir in sorted(root_path.glob("20??-??-??")):  # match YYYY-MM-DD
         if not date_dir.is_dir():
             continue
@@ -112,30 +259,37 @@ def collect_media(root_path: Path, compiled_path: Path):
                 continue
             device_name = device_dir.name
 
-            for media_file in device_dir.rglob("*"):
-                if media_file.suffix.lower() not in MEDIA_EXTS:
-                    continue
-
-                # Copy to compiled folder
-                dest = ensure_unique_name(compiled_path, media_file.name)
-                shutil.copy2(media_file, dest)
-
-                # Metadata
-                exif = extract_exif(media_file)
-                exif_keys.update(exif.keys())
-                record = {
-                    "File Name": dest.name,
-                    "Date": date_str,
-                    "Device": device_name,
-                    "MD5": md5sum(media_file),
-                }
-                record.update(exif)
-                for k, v in list(record.items()):
-                    value = normalize_exif_value(v)
-                    if not isinstance(value, (str, int, float, bool, datetime)):
-                        value = str(value)
-                    record[k] = value
-                records.append(record)
+            for entry in iter_media(device_dir):
+                sources.append((date_str, device_name, entry))
+
+    # Read EXIF in worker threads while files are copied (and hashed) here
+    paths = [entry.path for _, _, entry in sources]
+    taken = existing_names(compiled_path)
+    total = len(sources)
+    with ThreadPoolExecutor() as executor:
+        exifs = executor.map(extract_exif, paths)
+
+        for done, ((date_str, device_name, entry), exif) in enumerate(
+            zip(sources, exifs), start=1
+        ):
+            # Copy to compiled folder
+            dest = ensure_unique_name(compiled_path, entry.name, taken)
+            digest = copy_and_md5(entry.path, dest)
+
+            # Metadata
+            exif_keys.update(exif.keys())
+            record = {
+                "File Name": dest.name,
+                "Date": date_str,
+                "Device": device_name,
+                "MD5": digest,
+            }
+            # extract_exif already returns Excel-friendly values
+            record.update(exif)
+            records.append(record)
+
+            if progress_cb and (done % PROGRESS_EVERY == 0 or done == total):
+                progress_cb(done, total)
 
     return records, sorted(exif_keys)
 
@@ -145,16 +299,14 @@ def collect_media(root_path: Path, compiled_path: Path):
 def write_excel(records, exif_keys, logfile: Path | None = None):
     logfile = logfile or LOGFILE
     logfile.parent.mkdir(parents=True, exist_ok=True)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Media Metadata"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Media Metadata")
 
     headers = ["File Name", "Date", "Device", "MD5"] + list(exif_keys)
     ws.append(headers)
 
     for rec in records:
-        row = [rec.get(h, "") for h in headers]
-        ws.append(row)
+        ws.append(tuple(map(rec.get, headers, repeat(""))))
 
     wb.save(logfile)
 
@@ -2,6 +2,7 @@
 """Simple Tkinter GUI wrapper around collect_media.py."""
 
 from pathlib import Path
+import threading
 import tkinter as tk
 from tkinter import filedialog, ttk
 
@@ -42,18 +43,24 @@ def main():
 
         logfile = compiled_path / "compiled_media_log" / "compiled_media_log.xlsx"
 
-        progress.start()
-        window.update_idletasks()
-        try:
-            records, exif_keys = collect_media(root_path, compiled_path)
-            write_excel(records, exif_keys, logfile)
-            status_var.set(
-                f"Copied {len(records)} files from '{root_path}' to '{compiled_path}' and logged to '{logfile}'."
-            )
-        except Exception as e:  # pragma: no cover - user feedback
-            status_var.set(f"Error: {e}")
-        finally:
-            progress.stop()
+        def report(done, total):
+            window.after(0, lambda: progress.configure(maximum=total, value=done))
+
+        def worker():
+            try:
+                records, exif_keys = collect_media(root_path, compiled_path, report)
+                write_excel(records, exif_keys, logfile)
+                msg = f"Copied {len(records)} files from '{root_path}' to '{compiled_path}' and logged to '{logfile}'."
+            except Exception as e:  # pragma: no cover - user feedback
+                msg = f"Error: {e}"
+            window.after(0, lambda: [status_var.set(msg), run_button.configure(state="normal")])
+
+        # The copy runs in a background thread so the window stays responsive;
+        # progress is posted back to the Tk thread with ``after``.
+        progress.configure(value=0)
+        status_var.set("Collecting media...")
+        run_button.configure(state="disabled")
+        threading.Thread(target=worker, daemon=True).start()
 
     tk.Label(window, text="'VZMOBILE' Folder Path:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
     tk.Entry(window, textvariable=in_var, width=50).grid(row=0, column=1, padx=5)
@@ -63,9 +70,10 @@ def main():
     tk.Entry(window, textvariable=out_var, width=50).grid(row=1, column=1, padx=5)
     tk.Button(window, text="Browse", command=browse_out).grid(row=1, column=2, padx=5)
 
-    tk.Button(window, text="Run", command=run).grid(row=2, column=1, pady=10)
+    run_button = tk.Button(window, text="Run", command=run)
+    run_button.grid(row=2, column=1, pady=10)
 
-    progress = ttk.Progressbar(window, mode="indeterminate")
+    progress = ttk.Progressbar(window, mode="determinate")
     progress.grid(row=3, column=0, columnspan=3, sticky="ew", padx=5)
 
     tk.Label(window, textvariable=status_var, wraplength=400, justify="left").grid(
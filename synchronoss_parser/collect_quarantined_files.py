@@ -10,7 +10,13 @@ extensions are ignored after extraction.
 
 from __future__ import annotations
 
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
+from typing import Iterator
+import fnmatch
+import functools
 import os
 import shutil
 import sys
@@ -19,7 +25,7 @@ import zipfile
 import logging
 import re
 
-from .collect_media import ensure_unique_name
+from .collect_media import ensure_unique_name, existing_names, fast_copy, iter_files
 
 logger = logging.getLogger(__name__)
 
@@ -40,27 +46,40 @@ ALLOWED_MEDIA_EXTENSIONS = {
 # -------------------------------------------------------------
 
 MAX_PATH_WIN = 260
+_IS_WINDOWS = sys.platform.startswith("win")
+
+# Buffer size used when concatenating split archive parts
+COPY_BUFFER_SIZE = 1024 * 1024
 
 
 def _win_path(path: Path) -> Path:
     """Return path with Windows long-path prefix if needed."""
-    if sys.platform.startswith("win"):
-        path_str = str(path)
-        if not path_str.startswith("\\\\?\\"):
-            return Path("\\\\?\\" + path_str)
+    if not _IS_WINDOWS:
+        return path
+    path_str = str(path)
+    if not path_str.startswith("\\\\?\\"):
+        return Path("\\\\?\\" + path_str)
     return path
 
 
-def _shorten_dest(path: Path) -> Path:
-    """Shorten final path component if total length exceeds limits."""
+@functools.lru_cache(maxsize=None)
+def _path_limit(anchor: str) -> int:
+    """Return the maximum path length for the file system at ``anchor``.
+
+    Cached since every copy and rename asks, and the answer only changes
+    between file systems.
+    """
+    if _IS_WINDOWS:
+        return MAX_PATH_WIN
     try:
-        limit = (
-            MAX_PATH_WIN
-            if sys.platform.startswith("win")
-            else os.pathconf(path.anchor or "/", "PC_PATH_MAX")
-        )
+        return os.pathconf(anchor or "/", "PC_PATH_MAX")
     except (OSError, ValueError):
-        limit = 4096
+        return 4096
+
+
+def _shorten_dest(path: Path) -> Path:
+    """Shorten final path component if total length exceeds limits."""
+    limit = _path_limit(path.anchor)
 
     path_str = str(path)
     if len(path_str) <= limit:
@@ -76,10 +95,15 @@ def _shorten_dest(path: Path) -> Path:
     return parent / new_name
 
 
-def safe_rglob(root: Path, pattern: str):
-    """Yield paths matching pattern with long path handling."""
-    root = _win_path(root)
-    return root.rglob(pattern)
+def safe_rglob(root: Path, pattern: str) -> Iterator[Path]:
+    """Yield files below ``root`` whose name matches ``pattern``, with long path handling."""
+    # Match names the way Path.rglob would on this platform
+    flags = re.IGNORECASE if _IS_WINDOWS else 0
+    match = re.compile(fnmatch.translate(pattern), flags).match
+    # Only regular files: symlinks, sockets and the like are left alone
+    for entry in iter_files(_win_path(root)):
+        if match(entry.name) and entry.is_file(follow_symlinks=False):
+            yield Path(entry.path)
 
 
 def safe_rename(src: Path, dest: Path) -> Path:
@@ -91,11 +115,14 @@ def safe_rename(src: Path, dest: Path) -> Path:
 
 
 def safe_copy2(src: Path, dest: Path) -> Path:
-    """Copy handling long destination paths."""
+    """Copy handling long destination paths.
+
+    Data and metadata are copied as ``shutil.copy2`` would, via
+    :func:`fast_copy` so filesystems with reflinks can share extents.
+    """
     src = _win_path(src)
     dest = _shorten_dest(_win_path(dest))
-    shutil.copy2(src, dest)
-    return dest
+    return fast_copy(src, dest)
 
 # -------------------------------------------------------------
 # Default paths used when running as a script
@@ -107,6 +134,21 @@ DEFAULT_COMPILED = DEFAULT_ROOT / "Compiled Quarantine Files"
 # File type detection
 # -------------------------------------------------------------
 
+# Signatures found at the very start of a file, with their extensions
+_ZERO_OFFSET_SIGNATURES = (
+    b"\xFF\xD8\xFF",
+    b"\x89PNG\r\n\x1a\n",
+    b"GIF87a",
+    b"GIF89a",
+    b"BM",
+    b"%PDF",
+    b"ID3",
+)
+_ZERO_OFFSET_EXTENSIONS = (".jpg", ".png", ".gif", ".gif", ".bmp", ".pdf", ".mp3")
+
+# Length of the shortest signature (``BM``)
+_MIN_SIGNATURE_SIZE = min(map(len, _ZERO_OFFSET_SIGNATURES))
+
 def detect_extension(path: Path) -> str | None:
     """Return file extension based on signature bytes.
 
@@ -123,42 +165,201 @@ def detect_extension(path: Path) -> str | None:
     * MP4 ``ftyp`` (at offset 4)
     """
 
-    with path.open("rb") as f:
-        header = f.read(16)
-
-    signatures = {
-        (b"\xFF\xD8\xFF", 0): ".jpg",
-        (b"\x89PNG\r\n\x1a\n", 0): ".png",
-        (b"GIF87a", 0): ".gif",
-        (b"GIF89a", 0): ".gif",
-        (b"BM", 0): ".bmp",
-        (b"%PDF", 0): ".pdf",
-        (b"RIFF", 0): ".wav",
-        (b"ID3", 0): ".mp3",
-        (b"ftypqt", 4): ".mov",
-    }
-    for (sig, offset), ext in signatures.items():
-        if header[offset : offset + len(sig)] == sig:
-            if ext == ".wav" and header[8:12] != b"WAVE":
-                continue
-            return ext
+    return _extension_from_header(_read_header(path))
+
+
+# O_NOATIME (Linux) skips the access-time update a read would otherwise
+# cause; the kernel only allows it on files the caller owns
+_NOATIME = getattr(os, "O_NOATIME", 0)
+_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def _read_header(path: Path, size: int = 16) -> bytes:
+    """Return the first ``size`` bytes of ``path`` using raw file descriptors."""
+    flags = os.O_RDONLY | _BINARY
+    try:
+        fd = os.open(path, flags | _NOATIME)
+    except PermissionError:
+        if not _NOATIME:
+            raise
+        fd = os.open(path, flags)
+    try:
+        if hasattr(os, "pread"):
+            return os.pread(fd, size, 0)
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _extension_from_header(header: bytes) -> str | None:
+    """Return the extension for the first 16 bytes of a file, or ``None``."""
+    # One C-level multi-prefix test rules out most files before the loop
+    if header.startswith(_ZERO_OFFSET_SIGNATURES):
+        for sig, ext in zip(_ZERO_OFFSET_SIGNATURES, _ZERO_OFFSET_EXTENSIONS):
+            if header.startswith(sig):
+                return ext
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return ".wav"
+    if header[4:10] == b"ftypqt":
+        return ".mov"
     if len(header) >= 12 and header[4:8] == b"ftyp":
         return ".mp4"
     return None
 
 
-def rename_with_extension(path: Path) -> Path:
-    """Rename file to have correct extension if detectable."""
-    ext = detect_extension(path)
-    if ext and path.suffix.lower() != ext:
-        new_path = ensure_unique_name(path.parent, path.stem + ext)
-        return safe_rename(path, new_path)
-    return path
-
 # -------------------------------------------------------------
 # Main processing
 # -------------------------------------------------------------
 
+# Split archive part names: ``<base>.zip_file_<number>``
+_ZIP_PART_RE = re.compile(r"(.+)\.zip_file_(\d+)")
+
+# Characters Windows forbids in file names, replaced as ZipFile.extractall does
+_WINDOWS_UNSAFE_CHARS = str.maketrans(':<>"|?*', "_______")
+
+def _append_file(src, outf) -> None:
+    """Append the rest of open file ``src`` to open file ``outf``.
+
+    The data is moved in the kernel with ``os.copy_file_range`` or
+    ``os.sendfile`` where the platform allows it, falling back to
+    ``shutil.copyfileobj`` with large chunks.
+    """
+    outf.flush()
+    in_fd, out_fd = src.fileno(), outf.fileno()
+    offset = src.tell()
+    remaining = os.fstat(in_fd).st_size - offset
+    for kernel_copy in (_copy_file_range, _sendfile):
+        if remaining <= 0:
+            return
+        # Both write at the output's current position and report how much
+        # they wrote before any error, so the next method carries on there
+        copied = kernel_copy(in_fd, out_fd, offset, remaining)
+        offset += copied
+        remaining -= copied
+    if remaining > 0:
+        src.seek(offset)
+        outf.seek(0, os.SEEK_END)
+        shutil.copyfileobj(src, outf, COPY_BUFFER_SIZE)
+
+
+def _copy_file_range(in_fd: int, out_fd: int, offset: int, count: int) -> int:
+    """Copy up to ``count`` bytes from ``offset``; return how many were copied."""
+    if not hasattr(os, "copy_file_range"):
+        return 0
+    done = 0
+    try:
+        while done < count:
+            n = os.copy_file_range(in_fd, out_fd, count - done, offset + done)
+            if not n:
+                break
+            done += n
+    except OSError:
+        # Unsupported here (e.g. EXDEV, ENOSYS), possibly part-way through
+        pass
+    return done
+
+
+def _sendfile(in_fd: int, out_fd: int, offset: int, count: int) -> int:
+    """Copy up to ``count`` bytes from ``offset``; return how many were copied."""
+    # Only Linux accepts a regular file as the sendfile destination
+    if not sys.platform.startswith("linux"):
+        return 0
+    done = 0
+    try:
+        while done < count:
+            n = os.sendfile(out_fd, in_fd, offset + done, count - done)
+            if not n:
+                break
+            done += n
+    except OSError:
+        pass
+    return done
+
+
+def _concat_parts(out_path: Path, part_files: list[Path], strip_marker: bool) -> None:
+    """Concatenate ``part_files`` into ``out_path``.
+
+    When ``strip_marker`` is true a leading ``PK\\x07\\x08`` split-archive
+    signature on the first part is dropped.
+    """
+    with open(out_path, "wb", buffering=COPY_BUFFER_SIZE) as outf:
+        for i, part_file in enumerate(part_files):
+            with open(part_file, "rb") as pf:
+                if i == 0 and strip_marker:
+                    sig = pf.read(4)
+                    if sig != b"PK\x07\x08":
+                        outf.write(sig)
+                _append_file(pf, outf)
+
+
+def _extract_group(
+    base: Path, parts: list[tuple[int, Path]], workdir: Path
+) -> list[tuple[Path, str]]:
+    """Reassemble the split archive ``base`` inside ``workdir`` and extract it.
+
+    ``parts`` are ``(number, path)`` pairs sorted by part number. Returns
+    ``(scratch_path, name)`` pairs for the members whose extension, corrected
+    by signature, is allowed. ``name`` is the member's output name; the
+    scratch file is named after its index so a long member name never has
+    to fit below ``workdir``.
+    Raises :class:`zipfile.BadZipFile` if the combined archive is invalid.
+    """
+    # The parts are concatenated straight from where they lie, in part
+    # order. Only a leading ``.z01`` part (one followed by others) carries
+    # the split-archive marker.
+    part_files = [_win_path(src) for _, src in parts]
+    strip_marker = len(parts) > 1 and parts[0][0] == 1
+    combined = _shorten_dest(_win_path(workdir / (base.name + "_combined.zip")))
+    _concat_parts(combined, part_files, strip_marker)
+
+    # Members are streamed out of the archive one at a time. The header read
+    # for signature detection is reused as the start of the output, and
+    # members whose type is not allowed are never written at all.
+    extract_dir = _win_path(workdir / "extract")
+    extract_dir.mkdir()
+    extracted: list[tuple[Path, str]] = []
+    try:
+        with zipfile.ZipFile(combined) as zf:
+            for i, info in enumerate(zf.infolist()):
+                if info.is_dir():
+                    continue
+                # Too short to carry any signature: the name alone decides, so
+                # rejected members are not even opened
+                if info.file_size < _MIN_SIGNATURE_SIZE:
+                    name = _member_name(info.filename, None)
+                    if os.path.splitext(name)[1].lower() not in ALLOWED_MEDIA_EXTENSIONS:
+                        continue
+                with zf.open(info) as src:
+                    header = src.read(16)
+                    name = _member_name(info.filename, _extension_from_header(header))
+                    if os.path.splitext(name)[1].lower() not in ALLOWED_MEDIA_EXTENSIONS:
+                        continue
+                    dest = extract_dir / (str(i) + os.path.splitext(name)[1])
+                    with dest.open("wb") as outf:
+                        outf.write(header)
+                        shutil.copyfileobj(src, outf, COPY_BUFFER_SIZE)
+                extracted.append((dest, name))
+    finally:
+        # The extracted members are all that is needed from here on
+        combined.unlink(missing_ok=True)
+    return extracted
+
+
+def _member_name(filename: str, ext: str | None) -> str:
+    """Return the output name for archive member ``filename``.
+
+    The folder part is dropped and the extension is replaced by ``ext``
+    when the signature says otherwise.
+    """
+    name = filename.rpartition("/")[2]
+    if _IS_WINDOWS:
+        name = name.translate(_WINDOWS_UNSAFE_CHARS)
+    stem, suffix = os.path.splitext(name)
+    if ext and suffix.lower() != ext:
+        return stem + ext
+    return name
+
+
 def collect_quarantined_files(
     root: Path, compiled_path: Path
 ) -> tuple[list[Path], list[Path], int]:
@@ -172,84 +373,74 @@ def collect_quarantined_files(
     compiled_path.mkdir(parents=True, exist_ok=True)
     copied: list[Path] = []
     skipped: list[Path] = []
-
-    pattern = re.compile(r"(.+)\.zip_file_(\d+)")
-
-    all_paths = [p for p in safe_rglob(root, "*.zip_file_*") if p.is_file()]
+    # Names already used in compiled_path; saves a stat per candidate name
+    taken = existing_names(compiled_path)
+    # Names are trimmed to the path limit while they are made unique, so two
+    # long names that shorten alike still end up as two files
+    target = _win_path(compiled_path)
+    limit = _path_limit(target.anchor)
+
+    all_paths = list(safe_rglob(root, "*.zip_file_*"))
     total = len(all_paths)
 
-    groups: dict[Path, list[tuple[int, Path]]] = {}
+    groups: defaultdict[Path, list[tuple[int, Path]]] = defaultdict(list)
     for zip_path in all_paths:
-        match = pattern.match(zip_path.name)
-        if not match:
+        match = _ZIP_PART_RE.match(zip_path.name)
+        if match is None:
             skipped.append(zip_path)
             continue
 
-        base = zip_path.parent / match.group(1)
+        base_name, part_str = match.groups()
+        base = zip_path.parent / base_name
         ext = detect_extension(zip_path)
         if ext:
             if ext.lower() in ALLOWED_MEDIA_EXTENSIONS:
                 dest_name = base.name + ext
-                dest = ensure_unique_name(compiled_path, dest_name)
+                dest = ensure_unique_name(target, dest_name, taken, limit)
                 dest = safe_copy2(zip_path, dest)
                 copied.append(dest)
             else:
                 skipped.append(zip_path)
             continue
 
-        part = int(match.group(2))
-        groups.setdefault(base, []).append((part, zip_path))
+        groups[base].append((int(part_str), zip_path))
 
-    for base, parts in groups.items():
-        parts.sort(key=lambda x: x[0])
-        last_num = parts[-1][0]
+    # Split archives are reassembled and extracted in worker threads (zlib
+    # releases the GIL), each in its own scratch folder. Results are moved
+    # into ``compiled_path`` here, in group order, so unique naming stays
+    # deterministic and race free. The scratch folders live inside
+    # ``compiled_path`` so that move is a rename rather than another copy.
+    # At most ``workers`` groups are submitted ahead of the one being moved,
+    # which bounds how many scratch folders are on disk at once.
+    workers = os.cpu_count() or 1
 
+    def finish(parts: list[tuple[int, Path]], workdir: Path, future: Future) -> None:
         try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                tmpdir = Path(tmpdir)
-                for num, src in parts:
-                    if num == last_num:
-                        name = base.name + ".zip"
-                    else:
-                        name = f"{base.name}.z{num:02d}"
-                    dest = tmpdir / name
-                    safe_copy2(src, dest)
-
-                combined = tmpdir / (base.name + "_combined.zip")
-                with combined.open("wb") as outf:
-                    for i in range(1, last_num):
-                        part_file = tmpdir / f"{base.name}.z{i:02d}"
-                        if not part_file.exists():
-                            continue
-                        with part_file.open("rb") as pf:
-                            if i == 1:
-                                sig = pf.read(4)
-                                if sig != b"PK\x07\x08":
-                                    outf.write(sig)
-                            shutil.copyfileobj(pf, outf)
-                    with (tmpdir / (base.name + ".zip")).open("rb") as pf:
-                        shutil.copyfileobj(pf, outf)
-
-                extract_dir = tmpdir / "extract"
-                extract_dir.mkdir()
-                with zipfile.ZipFile(combined) as zf:
-                    zf.extractall(extract_dir)
-
-                copied_before = len(copied)
-                for extracted in extract_dir.rglob("*"):
-                    if extracted.is_dir():
-                        continue
-                    fixed = rename_with_extension(extracted)
-                    if fixed.suffix.lower() not in ALLOWED_MEDIA_EXTENSIONS:
-                        continue
-                    dest = ensure_unique_name(compiled_path, fixed.name)
-                    dest = safe_copy2(fixed, dest)
-                    copied.append(dest)
-                if len(copied) == copied_before:
-                    skipped.append(parts[-1][1])
+            extracted = future.result()
         except zipfile.BadZipFile:
-            skipped.append(parts[-1][1])
             logger.warning("Skipping invalid zip archive %s", parts[-1][1])
+            extracted = []
+        if not extracted:
+            skipped.append(parts[-1][1])
+        for fixed, name in extracted:
+            dest = ensure_unique_name(target, name, taken, limit)
+            dest = safe_rename(fixed, dest)
+            copied.append(dest)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with tempfile.TemporaryDirectory(dir=_win_path(compiled_path), prefix=".") as tmp_root, ThreadPoolExecutor(
+        max_workers=workers
+    ) as executor:
+        jobs: deque = deque()
+        for i, (base, parts) in enumerate(groups.items()):
+            parts.sort(key=itemgetter(0))
+            workdir = Path(tmp_root) / str(i)
+            workdir.mkdir()
+            jobs.append((parts, workdir, executor.submit(_extract_group, base, parts, workdir)))
+            if len(jobs) > workers:
+                finish(*jobs.popleft())
+        while jobs:
+            finish(*jobs.popleft())
 
     return copied, skipped, total
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Convert Synchronoss contacts exports to Excel files."""
 
-import sys, re, json, argparse
+import sys, re, json, argparse, mmap, os
 from pathlib import Path
 
 # Try imports and give friendly guidance if packages aren't installed
@@ -12,24 +12,55 @@ except ImportError:  # pragma: no cover - user guidance path
     print("Exiting due to missing dependency.")
     sys.exit(1)
 
+try:  # optional, much faster JSON decoder
+    import orjson
+except ImportError:  # pragma: no cover - orjson not installed
+    orjson = None
+
 # ----- helpers to clean/parse “almost JSON” -----
-def quick_clean(txt: str) -> str:
-    txt = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', txt)  # remove control chars
-    txt = re.sub(r',\s*([}\]])', r'\1', txt)                # trailing commas
+CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+CONTROL_BYTES_RE = re.compile(rb'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+TRAILING_COMMA_BYTES_RE = re.compile(rb',\s*([}\]])')
+
+# Both helpers accept ``str`` or UTF-8 ``bytes`` (or a buffer such as an
+# mmap) and return ``str`` or ``bytes``. Control bytes never occur inside
+# multi-byte UTF-8 sequences, so cleaning the raw bytes is safe.
+def quick_clean(txt):
+    if isinstance(txt, str):
+        txt = CONTROL_CHARS_RE.sub('', txt)       # remove control chars
+        txt = TRAILING_COMMA_RE.sub(r'\1', txt)   # trailing commas
+    else:
+        txt = CONTROL_BYTES_RE.sub(b'', txt)
+        txt = TRAILING_COMMA_BYTES_RE.sub(rb'\1', txt)
     return txt.strip()
 
-def coerce_to_json(txt: str) -> str:
+def coerce_to_json(txt):
     s = txt.strip()
-    if s.startswith('{"contacts"') and not s.endswith('}'):
-        s = s.rstrip() + "}}"
-    if s.startswith('[') and not s.endswith(']'):
-        s = s.rstrip().rstrip(',') + ']'
+    lit = str.encode if isinstance(s, bytes) else str
+    if s.startswith(lit('{"contacts"')) and not s.endswith(lit('}')):
+        s = s.rstrip() + lit("}}")
+    if s.startswith(lit('[')) and not s.endswith(lit(']')):
+        s = s.rstrip().rstrip(lit(',')) + lit(']')
     return s
 
-def parse_contacts(raw_text: str):
+def _loads(txt):
+    """Decode ``txt`` with orjson when available, else the ``json`` module."""
+    if orjson is not None:
+        try:
+            return orjson.loads(txt)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (NaN, Infinity, invalid UTF-8); let json
+            # decide whether the text is really invalid
+            pass
+    if isinstance(txt, bytes):
+        txt = txt.decode("utf-8", errors="ignore")
+    return json.loads(txt)
+
+def parse_contacts(raw_text):
     txt = coerce_to_json(quick_clean(raw_text))
     try:
-        data = json.loads(txt)
+        data = _loads(txt)
     except json.JSONDecodeError as e:
         raise ValueError(f"JSON parse error at char {e.pos}: {e.msg}")
     if isinstance(data, dict):
@@ -52,29 +83,64 @@ def normalize_lists_to_strings(df):
         df[col] = df[col].apply(list_to_str)
     return df
 
+# ``key=value`` pairs inside the flattened ``tel`` column, e.g.
+# "number=555, type=cell; number=556, type=work"
+TEL_FIELD_RE = r"(?:^|[;,])\s*(?P<key>number|type|preference)\s*=(?P<val>[^;,]*)"
+TEL_COLUMNS = {'number': 'phone_numbers', 'type': 'phone_types', 'preference': 'phone_preferences'}
+
 def extract_phone_columns(df):
     if 'tel' in df.columns:
-        numbers, types, prefs = [], [], []
-        for val in df['tel'].fillna(""):
-            num_list, type_list, pref_list = [], [], []
-            for part in str(val).split(';'):
-                for kv in part.split(','):
-                    k, _, v = kv.partition('=')
-                    k, v = k.strip(), v.strip()
-                    if k == 'number' and v: num_list.append(v)
-                    elif k == 'type' and v: type_list.append(v)
-                    elif k == 'preference' and v: pref_list.append(v)
-            numbers.append("; ".join(num_list) or None)
-            types.append("; ".join(type_list) or None)
-            prefs.append("; ".join(pref_list) or None)
-        df['phone_numbers'] = numbers
-        df['phone_types'] = types
-        df['phone_preferences'] = prefs
+        # One regex pass over the whole column instead of a Python loop per row
+        parts = df['tel'].fillna("").astype(str).str.extractall(TEL_FIELD_RE)
+        parts['val'] = parts['val'].str.strip()
+        parts = parts[parts['val'] != ""]
+        joined = (
+            parts.groupby([parts.index.get_level_values(0), 'key'], sort=False)['val']
+            .agg("; ".join)
+            .unstack()
+        )
+        for key, col in TEL_COLUMNS.items():
+            values = joined[key] if key in joined.columns else pd.Series(dtype=object)
+            df[col] = values.reindex(df.index)
     return df
 
-def build_dataframe(contacts):
+def _flatten_into(record, prefix, out):
+    for k, v in record.items():
+        if isinstance(v, dict):
+            _flatten_into(v, f"{prefix}{k}.", out)
+        else:
+            out[prefix + k] = v
+
+def flatten_contacts(contacts):
+    """Flatten ``contacts`` into a DataFrame, like ``pd.json_normalize(contacts, sep='.')``.
+
+    Values are placed straight into per-column lists, skipping the generic
+    record normalization and the row-wise DataFrame construction.
+    """
     import pandas as pd
-    df = pd.json_normalize(contacts, sep='.')
+    n = len(contacts)
+    columns = {}
+    row = {}
+    for i, contact in enumerate(contacts):
+        # Top-level scalars come first, then nested fields, matching the
+        # column order json_normalize produces
+        row.clear()
+        nested = {}
+        for k, v in contact.items():
+            if isinstance(v, dict):
+                nested[k] = v
+            else:
+                row[k] = v
+        _flatten_into(nested, "", row)
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [float("nan")] * n
+            column[i] = value
+    return pd.DataFrame(columns, index=pd.RangeIndex(n))
+
+def build_dataframe(contacts):
+    df = flatten_contacts(contacts)
     df = normalize_lists_to_strings(df)
     df = extract_phone_columns(df)
     preferred = [
@@ -84,16 +150,35 @@ def build_dataframe(contacts):
     cols = [c for c in preferred if c in df.columns] + [c for c in df.columns if c not in preferred]
     return df[cols]
 
+def write_excel(df, output_file: str) -> None:
+    """Write ``df`` to ``output_file``, streaming rows in write-only mode."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Sheet1")
+    ws.append(list(df.columns))
+    # Missing values become empty cells, as DataFrame.to_excel writes them
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        ws.append(row)
+    wb.save(output_file)
+
 def convert_contacts(input_file: str, output_file: str) -> int:
     """Convert a Synchronoss contacts dump to Excel."""
     in_path = Path(input_file)
     if not in_path.exists():
         raise FileNotFoundError(f"File not found: {in_path}")
 
-    raw = in_path.read_text(encoding="utf-8", errors="ignore")
-    contacts = parse_contacts(raw)
+    # Map the file rather than decoding it into one big string; the cleanup
+    # runs on the raw bytes, which orjson can decode without a copy to str
+    with in_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            contacts = parse_contacts(b"")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                contacts = parse_contacts(mm)
     df = build_dataframe(contacts)
-    df.to_excel(output_file, index=False)
+    write_excel(df, output_file)
     return len(df)
 
 
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 """Utilities for decrypting and unpacking Synchronoss archives."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import os
 import shutil
 import subprocess
 import zipfile
@@ -45,59 +47,25 @@ def decrypt_and_unzip(
     with zipfile.ZipFile(archive_path) as zf:
         zf.extractall(output_dir)
 
+    # Each pass finds the archives below the folders produced by the previous
+    # one and expands them concurrently; zlib and gpg both run outside the
+    # GIL. ``processed`` is only touched from this thread.
     processed: set[Path] = set()
     dirs_to_walk: list[Path] = [output_dir]
 
-    while dirs_to_walk:
-        current = dirs_to_walk.pop()
-        for item in current.iterdir():
-            if item.is_dir():
-                dirs_to_walk.append(item)
-                continue
-
-            if item.suffix == ".zip" and item not in processed:
-                dest = item.with_suffix("")
-                with zipfile.ZipFile(item) as zf:
-                    zf.extractall(dest)
-                if cleanup:
-                    item.unlink(missing_ok=True)
-                processed.add(item)
-                dirs_to_walk.append(dest)
-                continue
-
-            if item.suffix == ".gpg" and item not in processed:
-                if shutil.which("gpg") is None:
-                    raise FileNotFoundError("'gpg' executable is required to decrypt files")
-                decrypted_path = item.with_suffix("")
-                cmd = [
-                    "gpg",
-                    "--batch",
-                    "--yes",
-                    "--passphrase",
-                    password,
-                    "-o",
-                    str(decrypted_path),
-                    "-d",
-                    str(item),
-                ]
-                proc = subprocess.run(cmd, capture_output=True, text=True)
-                if proc.returncode != 0:
-                    msg = proc.stderr.strip() or proc.stdout.strip()
-                    raise RuntimeError(f"Failed to decrypt {item}: {msg}")
-                if zipfile.is_zipfile(decrypted_path):
-                    dest = decrypted_path.with_suffix("")
-                    with zipfile.ZipFile(decrypted_path) as zf:
-                        zf.extractall(dest)
-                    if cleanup:
-                        decrypted_path.unlink(missing_ok=True)
-                        item.unlink(missing_ok=True)
-                    processed.update({item, decrypted_path})
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        while dirs_to_walk:
+            archives = _find_archives(dirs_to_walk, processed)
+            if any(item.suffix == ".gpg" for item in archives) and shutil.which("gpg") is None:
+                raise FileNotFoundError("'gpg' executable is required to decrypt files")
+
+            dirs_to_walk = []
+            jobs = [executor.submit(_expand_archive, item, password, cleanup) for item in archives]
+            for job in jobs:
+                done, dest = job.result()
+                processed.update(done)
+                if dest is not None:
                     dirs_to_walk.append(dest)
-                else:
-                    if cleanup:
-                        item.unlink(missing_ok=True)
-                    processed.add(item)
-                continue
 
     files = [
         p
@@ -106,3 +74,69 @@ def decrypt_and_unzip(
     ]
     files.sort()
     return files
+
+
+def _find_archives(dirs: list[Path], processed: set[Path]) -> list[Path]:
+    """Return unprocessed ``.zip`` and ``.gpg`` files anywhere below ``dirs``."""
+    archives: list[Path] = []
+    stack = [str(d) for d in dirs]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1] in (".zip", ".gpg"):
+                    item = Path(entry.path)
+                    if item not in processed:
+                        archives.append(item)
+    return archives
+
+
+def _expand_archive(item: Path, password: str, cleanup: bool) -> tuple[set[Path], Path | None]:
+    """Extract or decrypt a single nested archive.
+
+    Returns the paths that were handled and the folder that was extracted
+    to, if any, so the caller can look inside it for further archives.
+    """
+    if item.suffix == ".zip":
+        dest = item.with_suffix("")
+        with zipfile.ZipFile(item) as zf:
+            zf.extractall(dest)
+        if cleanup:
+            item.unlink(missing_ok=True)
+        return {item}, dest
+
+    decrypted_path = item.with_suffix("")
+    _gpg_decrypt(item, decrypted_path, password)
+    if zipfile.is_zipfile(decrypted_path):
+        dest = decrypted_path.with_suffix("")
+        with zipfile.ZipFile(decrypted_path) as zf:
+            zf.extractall(dest)
+        if cleanup:
+            decrypted_path.unlink(missing_ok=True)
+            item.unlink(missing_ok=True)
+        return {item, decrypted_path}, dest
+    if cleanup:
+        item.unlink(missing_ok=True)
+    return {item}, None
+
+
+def _gpg_decrypt(src: Path, dest: Path, password: str) -> None:
+    """Decrypt ``src`` into ``dest`` with gpg, raising ``RuntimeError`` on failure."""
+    # The passphrase is piped on stdin rather than passed in argv, where it
+    # would be visible to other users in the process list
+    cmd = [
+        "gpg",
+        "--batch",
+        "--yes",
+        "--passphrase-fd",
+        "0",
+        "-o",
+        str(dest),
+        "-d",
+        str(src),
+    ]
+    proc = subprocess.run(cmd, input=password, capture_output=True, text=True)
+    if proc.returncode != 0:
+        msg = proc.stderr.strip() or proc.stdout.strip()
+        raise RuntimeError(f"Failed to decrypt {src}: {msg}")
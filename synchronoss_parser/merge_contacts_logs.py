@@ -21,19 +21,29 @@ except ImportError:  # pragma: no cover - user guidance path
     print("Exiting due to missing dependency.")
     sys.exit(1)
 
-from .render_transcripts import build_contact_lookup
+from .render_transcripts import build_contact_map, normalize_phone_series
+
+
+def name_column(numbers: pd.Series, mapping: dict) -> pd.Series:
+    """Return ``numbers`` with every known number replaced by its contact name.
+
+    Equivalent to ``numbers.apply(build_contact_lookup(...))`` but the
+    normalization and dictionary lookups run column-wide.
+    """
+    names = normalize_phone_series(numbers).map(mapping)
+    return numbers.astype(object).where(names.isna(), names)
 
 
 def merge_call_log(call_log_csv: str, contacts_xlsx: str, output_csv: str) -> int:
     """Merge call log with contacts and write a new CSV."""
-    lookup = build_contact_lookup(contacts_xlsx)
+    mapping = build_contact_map(contacts_xlsx)
     df = pd.read_csv(call_log_csv)
     if "caller" in df.columns:
-        df["caller_name"] = df["caller"].apply(lookup)
+        df["caller_name"] = name_column(df["caller"], mapping)
     else:
         df["caller_name"] = ""
     if "recipient" in df.columns:
-        df["recipient_name"] = df["recipient"].apply(lookup)
+        df["recipient_name"] = name_column(df["recipient"], mapping)
     else:
         df["recipient_name"] = ""
     df.to_csv(output_csv, index=False)
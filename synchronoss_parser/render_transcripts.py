@@ -44,16 +44,31 @@ Notes:
 
 import argparse
 import csv
+import functools
+import gzip
 import html
 import json
 import os
+import re
+import sys
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
 
 import pandas as pd
 
+try:  # optional: multithreaded C++ CSV tokenizer
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow not installed
+    pa = pa_csv = None
+
+from . import utils
+
 
 # ------------------------- Config & Utilities -------------------------
 
@@ -62,6 +77,13 @@ VIDEO_EXTS = {".mp4", ".webm", ".ogg", ".mov", ".m4v"}
 AUDIO_EXTS = {".mp3", ".wav", ".m4a", ".aac", ".flac", ".ogg"}
 INLINE_TEXT_EXTS = {".vcard", ".vcf"}  # small text-like files we might show inline
 
+CSV_READ_BUFFER = 1 << 20  # bytes; large reads cut syscalls on big CSVs
+
+# Columns read from each message CSV
+MESSAGE_CSV_COLUMNS = (
+    "Date", "Type", "Direction", "Attachments", "Body", "Sender", "Recipients", "Message ID",
+)
+
 CSV_DATE_FROM_FILENAME_FMT = "%Y%m%d"
 ATTACHMENT_FOLDER_DATE_FMT = "%Y-%m-%d"
 
@@ -129,6 +151,7 @@ body {
 .footer a { color: #93c5fd; text-decoration: none; }
 .footer a:hover { text-decoration: underline; }
 .code { font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size: 12px; }
+.message.hide { display: none; }
 """
 
 INDEX_CSS = """
@@ -145,7 +168,11 @@ h1 { margin: 0 0 8px; font-size: 24px; }
 .meta { color:#cbd5e1; font-size: 12px; margin-top: 4px; }
 """
 
-@dataclass
+# Slotted instances are smaller and faster to read; ``slots=`` needs 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Message:
     date_raw: str
     date_dt: Optional[datetime]
@@ -157,9 +184,63 @@ class Message:
     recipients: str
     message_id: str
     attachment_day: Optional[str] = None
+    # ``recipients`` already split into its parts, when the loader has done so
+    recipient_list: Optional[List[str]] = None
+
+
+# Undated messages sort after every dated one
+_DATE_MAX = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def _chronological_key(m: Message) -> Tuple[datetime, str]:
+    return (m.date_dt or _DATE_MAX, m.date_raw)
+
+
+# Fallback ``strptime`` formats for dates ``fromisoformat`` rejects. No
+# string matches more than one of them, so the order they are tried in
+# does not change the result.
+CSV_DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%dT%H:%M:%S%z",
+]
+_last_date_format = CSV_DATE_FORMATS[0]
+
+# US style "01/20/2024 10:11:12" with optional AM/PM: the formats that
+# reach strptime in practice, matched in one pass without its overhead
+_US_DATE_RE = re.compile(
+    r"(\d{1,2})/(\d{1,2})/(\d{4})\s+(\d{1,2}):(\d{1,2}):(\d{1,2})(?:\s+([AaPp][Mm]))?"
+)
+
+
+def _parse_us_date(s: str) -> Optional[datetime]:
+    """Return ``s`` parsed as a US style date, or ``None`` if it is not one."""
+    m = _US_DATE_RE.fullmatch(s)
+    if m is None:
+        return None
+    month, day, year, hour, minute, second, ampm = m.groups()
+    hour = int(hour)
+    if ampm:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if ampm.upper() == "PM" else 0)
+    try:
+        return datetime(int(year), int(month), int(day), hour, int(minute), int(second))
+    except ValueError:
+        return None
 
 
+@functools.lru_cache(maxsize=1 << 16)
 def parse_csv_date(value: str) -> Optional[datetime]:
+    """Parse a CSV ``Date`` value, returning ``None`` if it is not a date.
+
+    Results are cached: message dumps repeat the same timestamps many times
+    and the returned ``datetime`` objects are immutable.
+    """
+    global _last_date_format
     if not value:
         return None
     s = value.strip()
@@ -174,20 +255,18 @@ def parse_csv_date(value: str) -> Optional[datetime]:
         return datetime.fromisoformat(s)
     except Exception:
         pass
-    # Try common formats
-    fmts = [
-        "%Y-%m-%d %H:%M:%S",
-        "%m/%d/%Y %H:%M:%S",
-        "%m/%d/%Y %I:%M:%S %p",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%dT%H:%M:%S%z",
-    ]
-    for f in fmts:
+    dt = _parse_us_date(s)
+    if dt is not None:
+        return dt
+    # Try common formats, starting with the one that matched last time as
+    # a file's dates nearly always share one format
+    for f in (_last_date_format, *CSV_DATE_FORMATS):
         try:
-            return datetime.strptime(s, f)
+            dt = datetime.strptime(s, f)
         except Exception:
             continue
+        _last_date_format = f
+        return dt
     # Fallback: epoch seconds or ms?
     try:
         n = int(s)
@@ -198,6 +277,10 @@ def parse_csv_date(value: str) -> Optional[datetime]:
         return None
 
 
+# Delimiters accepted between attachment names
+_ATTACHMENT_SEP_RE = re.compile(r"[|,;]+")
+
+
 def split_attachments(field: str) -> List[str]:
     if not field:
         return []
@@ -213,12 +296,70 @@ def split_attachments(field: str) -> List[str]:
         except Exception:
             pass
     # Fallback: split on common delimiters (semicolon strongest for your data)
-    parts = []
-    for chunk in s.replace("|", ";").replace(",", ";").split(";"):
-        c = chunk.strip()
-        if c:
-            parts.append(c)
-    return parts
+    return [c for c in map(str.strip, _ATTACHMENT_SEP_RE.split(s)) if c]
+
+
+def read_csv_columns(csv_file: Path, columns: Sequence[str]) -> Iterator[Tuple[str, ...]]:
+    """Yield the values of ``columns`` for every row of ``csv_file``.
+
+    The header is resolved to column positions once, so rows are plain
+    ``csv.reader`` lists rather than a dict per row. Columns missing from the
+    header, or cut off in a short row, come back as empty strings. Blank lines
+    are skipped, as ``csv.DictReader`` does.
+
+    When pyarrow is installed the file is tokenized by ``pyarrow.csv``;
+    files it rejects (ragged rows, for instance) are read with ``csv.reader``.
+    """
+    if pa_csv is not None:
+        columns = list(columns)
+        try:
+            table = pa_csv.read_csv(
+                str(csv_file),
+                parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={name: pa.string() for name in columns},
+                    include_columns=columns,
+                    include_missing_columns=True,
+                ),
+            )
+        except (pa.ArrowInvalid, UnicodeDecodeError):
+            table = None
+        if table is not None:
+            values = []
+            for name in columns:
+                column = table.column(name)
+                if column.null_count:
+                    # Only columns absent from the header hold nulls
+                    column = column.fill_null("")
+                values.append(column.to_pylist())
+            yield from zip(*values)
+            return
+
+    # utf-8-sig drops a leading BOM, which pyarrow also ignores
+    with csv_file.open("r", encoding="utf-8-sig", newline="", buffering=CSV_READ_BUFFER) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        width = len(header)
+        # Duplicate names resolve to the first such column, as in pyarrow
+        positions: Dict[str, int] = {}
+        for i, name in enumerate(header):
+            positions.setdefault(name, i)
+        # Absent columns point at a padding slot appended to every row
+        indexes = [positions.get(name, width) for name in columns]
+        if len(indexes) == 1:
+            index = indexes[0]
+            getter = lambda row: (row[index],)
+        else:
+            getter = itemgetter(*indexes)
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != width:
+                row = (row + [""] * width)[:width]
+            row.append("")
+            yield getter(row)
 
 
 def derive_attachment_day_from_csv_name(csv_path: Path) -> Optional[str]:
@@ -231,31 +372,39 @@ def derive_attachment_day_from_csv_name(csv_path: Path) -> Optional[str]:
         return None
 
 
+# Extension -> kind in one table; earlier sets win where they overlap
+# (``.ogg`` is treated as video)
+EXT_KINDS = {
+    ext: kind
+    for kind, exts in reversed(
+        [("image", IMAGE_EXTS), ("video", VIDEO_EXTS), ("audio", AUDIO_EXTS), ("inline_text", INLINE_TEXT_EXTS)]
+    )
+    for ext in exts
+}
+
+
 def classify_ext(path: Path) -> str:
-    ext = path.suffix.lower()
-    if ext in IMAGE_EXTS:
-        return "image"
-    if ext in VIDEO_EXTS:
-        return "video"
-    if ext in AUDIO_EXTS:
-        return "audio"
-    if ext in INLINE_TEXT_EXTS:
-        return "inline_text"
-    return "other"
+    return EXT_KINDS.get(path.suffix.lower(), "other")
+
+
+# Characters html.escape() rewrites; most text contains none of them
+_UNSAFE_HTML_RE = re.compile(r"[&<>\"']")
 
 
 def safe_text(s: Optional[str]) -> str:
     if s is None:
         return ""
-    return html.escape(str(s))
+    s = str(s)
+    # One scan instead of html.escape()'s five replace() passes
+    return html.escape(s) if _UNSAFE_HTML_RE.search(s) else s
 
 
 def normalize_phone_number(number: str) -> str:
     """Return a canonical form for a phone number.
 
-    All non-digit characters are stripped and a leading ``1`` (US/Canada
-    country code) is removed when the result would otherwise be eleven
-    digits. Examples::
+    Non-digits are stripped by :func:`utils.normalize_phone_number` and a
+    leading ``1`` (US/Canada country code) is removed when the result would
+    otherwise be eleven digits. Examples::
 
         normalize_phone_number("+1 111-222-3333") -> "1112223333"
         normalize_phone_number("(111) 222-3333") -> "1112223333"
@@ -266,31 +415,51 @@ def normalize_phone_number(number: str) -> str:
     ``1112223333``.
     """
 
-    digits = "".join(ch for ch in str(number) if ch.isdigit())
+    digits = utils.normalize_phone_number(str(number))
     if len(digits) == 11 and digits.startswith("1"):
         digits = digits[1:]
     return digits
 
 
-def build_contact_lookup(xlsx_path: Optional[str]) -> Callable[[str], str]:
-    """Return a lookup function mapping phone numbers to contact names."""
+def normalize_phone_series(numbers: pd.Series) -> pd.Series:
+    """Apply :func:`normalize_phone_number` to every value of a pandas Series.
+
+    Each distinct value is normalized once, since contact sheets and call
+    logs repeat the same numbers many times. The scalar function is used
+    rather than a ``\\D`` regex so both forms agree on non-ASCII digits.
+    """
+    numbers = numbers.astype(str)
+    uniques = numbers.unique()
+    return numbers.map(dict(zip(uniques, map(normalize_phone_number, uniques))))
+
+
+def build_contact_map(xlsx_path: Optional[str]) -> Dict[str, str]:
+    """Return a dict mapping normalized phone numbers to contact names."""
     mapping: Dict[str, str] = {}
     if xlsx_path:
         try:
             df = pd.read_excel(xlsx_path)
-            for _, row in df.iterrows():
-                first = str(row.get("firstname") or "").strip()
-                last = str(row.get("lastname") or "").strip()
-                numbers = str(row.get("phone_numbers") or "").split(";")
-                name = f"{first} {last}".strip()
-                if not name:
-                    continue
-                for num in numbers:
-                    digits = normalize_phone_number(num)
-                    if digits:
-                        mapping[digits] = name
+
+            def column(name: str) -> pd.Series:
+                if name not in df.columns:
+                    return pd.Series("", index=df.index)
+                return df[name].fillna("").astype(str)
+
+            # Column-wise: one row per (name, number) pair, later rows win
+            names = (column("firstname").str.strip() + " " + column("lastname").str.strip()).str.strip()
+            pairs = pd.DataFrame({"name": names, "number": column("phone_numbers").str.split(";")})
+            pairs = pairs[names != ""].explode("number")
+            digits = normalize_phone_series(pairs["number"])
+            found = digits != ""
+            mapping = dict(zip(digits[found], pairs["name"][found]))
         except Exception:
             pass
+    return mapping
+
+
+def build_contact_lookup(xlsx_path: Optional[str]) -> Callable[[str], str]:
+    """Return a lookup function mapping phone numbers to contact names."""
+    mapping = build_contact_map(xlsx_path)
 
     def lookup(number: str) -> str:
         digits = normalize_phone_number(number)
@@ -303,6 +472,70 @@ def build_attachment_path(messages_root: Path, msg_type: str, direction: str, da
     return messages_root / "attachments" / msg_type / direction / day_str / filename
 
 
+def attachment_dir_builder(messages_root: Path) -> Callable[[str, str, str], Path]:
+    """Return a cached ``(msg_type, direction, day_str) -> folder`` function.
+
+    ``build_attachment_path(root, t, d, day, name)`` equals
+    ``attachment_dir_builder(root)(t, d, day) / name``; callers looping over
+    many attachments reuse the few distinct folders instead of rebuilding
+    the whole path each time.
+    """
+    attachments_root = messages_root / "attachments"
+
+    @functools.lru_cache(maxsize=None)
+    def attachment_dir(msg_type: str, direction: str, day_str: str) -> Path:
+        return attachments_root / msg_type / direction / day_str
+
+    return attachment_dir
+
+
+# Names compare case-insensitively where the filesystem usually does
+_fold_case = str.casefold if sys.platform in ("win32", "darwin") else str
+
+
+def _fold_name(name: str) -> str:
+    """Return ``name`` in the form attachment names are compared in.
+
+    Names are NFC-normalized first: macOS and some exports store accented
+    names decomposed (NFD) while the CSVs spell them composed, or the other
+    way round.
+    """
+    return _fold_case(unicodedata.normalize("NFC", name))
+
+
+def _list_dir(dirpath: str) -> Dict[str, str]:
+    """Map the folded entry names of ``dirpath`` to the names on disk.
+
+    One ``scandir`` per attachment folder replaces a ``stat`` per file.
+    Returns an empty dict if ``dirpath`` is not a folder.
+    """
+    try:
+        with os.scandir(dirpath) as it:
+            return {_fold_name(e.name): e.name for e in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def prefetch_attachment_dirs(
+    messages_root: Path, msgs: Sequence[Message]
+) -> Dict[str, Dict[str, str]]:
+    """List every folder ``msgs`` may take attachments from.
+
+    Listing the folders concurrently hides per-directory latency on slow
+    or networked volumes. Returns a dict of folder path to its
+    :func:`_list_dir` listing, to be passed to :func:`render_thread_html` as ``dir_index``.
+    """
+    attachment_dir = attachment_dir_builder(messages_root)
+    dirs = set()
+    for m in msgs:
+        if m.attachments and m.attachment_day:
+            primary_dir = attachment_dir(m.msg_type or "", m.direction or "", m.attachment_day)
+            dirs.add(str(primary_dir))
+            dirs.add(str(primary_dir.parent))
+    with ThreadPoolExecutor() as executor:
+        return dict(zip(dirs, executor.map(_list_dir, dirs)))
+
+
 def relpath_for_html(from_file: Path, to_target: Path) -> str:
     try:
         return os.path.relpath(to_target, start=from_file.parent).replace(os.sep, "/")
@@ -313,41 +546,34 @@ def relpath_for_html(from_file: Path, to_target: Path) -> str:
 def load_messages_from_csv(csv_file: Path, contact_lookup: Callable[[str], str] = lambda x: x) -> List[Message]:
     msgs: List[Message] = []
     day_folder = derive_attachment_day_from_csv_name(csv_file)
-    with csv_file.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            date_raw = (row.get("Date") or "").strip()
-            date_dt = parse_csv_date(date_raw)
-            msg_type = (row.get("Type") or "").strip().lower()
-            direction = (row.get("Direction") or "").strip().lower()
-            attachments_field = row.get("Attachments")
-            attachments = split_attachments(attachments_field) if attachments_field else []
-            body = row.get("Body") or ""
-            sender = contact_lookup(row.get("Sender") or "")
-            raw_recip = row.get("Recipients") or ""
-            recip_parts = []
-            for part in raw_recip.replace(",", ";").split(";"):
-                p = part.strip()
-                if p:
-                    recip_parts.append(contact_lookup(p))
-            recipients = "; ".join(recip_parts)
-            message_id = row.get("Message ID") or ""
-            msgs.append(
-                Message(
-                    date_raw,
-                    date_dt,
-                    msg_type,
-                    direction,
-                    attachments,
-                    body,
-                    sender,
-                    recipients,
-                    message_id,
-                    day_folder,
-                )
+    # The same few numbers recur on every row
+    contact_lookup = functools.lru_cache(maxsize=4096)(contact_lookup)
+    rows = read_csv_columns(csv_file, MESSAGE_CSV_COLUMNS)
+    for date_raw, msg_type, direction, attachments_field, body, sender, raw_recip, message_id in rows:
+        date_raw = date_raw.strip()
+        recip_parts = []
+        for part in raw_recip.replace(",", ";").split(";"):
+            p = part.strip()
+            if p:
+                recip_parts.append(contact_lookup(p))
+        msgs.append(
+            Message(
+                date_raw,
+                parse_csv_date(date_raw),
+                # A handful of values repeat on every row; share one copy
+                sys.intern(msg_type.strip().lower()),
+                sys.intern(direction.strip().lower()),
+                split_attachments(attachments_field),
+                body,
+                sys.intern(contact_lookup(sender)),
+                "; ".join(recip_parts),
+                message_id,
+                day_folder,
+                recip_parts,
             )
+        )
     # Sort chronologically with stable fallback to raw string
-    msgs.sort(key=lambda m: (m.date_dt or datetime.max.replace(tzinfo=timezone.utc), m.date_raw))
+    msgs.sort(key=_chronological_key)
     return msgs
 
 
@@ -369,12 +595,14 @@ def group_messages_by_chat(messages: List[Message], target: str) -> Dict[Tuple[s
                 m.sender = target
             if m.direction == "in" and not m.recipients:
                 m.recipients = target
-        recips: List[str] = []
-        if m.recipients:
-            for part in m.recipients.replace(",", ";").split(";"):
-                p = part.strip()
-                if p:
-                    recips.append(p)
+        recips = m.recipient_list
+        if recips is None:
+            recips = []
+            if m.recipients:
+                for part in m.recipients.replace(",", ";").split(";"):
+                    p = part.strip()
+                    if p:
+                        recips.append(p)
         participants = set(recips)
         if m.sender:
             participants.add(m.sender)
@@ -382,13 +610,101 @@ def group_messages_by_chat(messages: List[Message], target: str) -> Dict[Tuple[s
             participants.add(target)
         key = tuple(sorted(participants))
         groups.setdefault(key, []).append(m)
+    # Messages arrive in per-file chronological runs, which sort() merges
+    # in linear time
     for lst in groups.values():
-        lst.sort(key=lambda mm: (mm.date_dt or datetime.max.replace(tzinfo=timezone.utc), mm.date_raw))
+        lst.sort(key=_chronological_key)
     return groups
 
 
 # ------------------------- HTML Rendering -------------------------
 
+# Escapes the few distinct direction/type values once instead of per message
+_escape_token = functools.lru_cache(maxsize=256)(html.escape)
+
+
+@functools.lru_cache(maxsize=4096)
+def _day_label(day: date) -> str:
+    return day.strftime("%A, %B %d, %Y")
+
+
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def search_text(fragment: str) -> str:
+    """Return the lower-cased text of an HTML ``fragment``, as the browser's
+    ``textContent`` would give it but with runs of whitespace collapsed."""
+    text = _TAG_RE.sub("", fragment)
+    if "&" in text:
+        text = html.unescape(text)
+    return " ".join(text.split()).lower()
+
+
+# Filters messages against the IDX array emitted with each thread instead of
+# re-reading every message's textContent on each keystroke. Typing faster
+# than the display refreshes only runs the last query.
+THREAD_SEARCH_JS = (
+    "const s=document.getElementById('search'),msgs=document.querySelectorAll('.message');let frame=0;\n"
+    "s&&s.addEventListener('input',()=>{cancelAnimationFrame(frame);frame=requestAnimationFrame(()=>{"
+    "const q=s.value.toLowerCase();IDX.forEach((t,i)=>msgs[i].classList.toggle('hide',q!==''&&!t.includes(q)));});});"
+)
+
+
+def attachment_snippet(out_file: Path, chosen: Path, fname: str) -> str:
+    """Return the ``<div class="attachment">`` markup for file ``chosen``."""
+    kind = classify_ext(chosen)
+    rel = relpath_for_html(out_file, chosen)
+    if kind == "image":
+        return f"<div class=\"attachment\"><img loading=\"lazy\" src=\"{rel}\" alt=\"{html.escape(fname)}\"></div>"
+    if kind == "video":
+        return f"<div class=\"attachment\"><video controls preload=\"metadata\" src=\"{rel}\"></video></div>"
+    if kind == "audio":
+        return f"<div class=\"attachment\"><audio controls preload=\"metadata\" src=\"{rel}\"></audio></div>"
+    if kind == "inline_text":
+        try:
+            text = chosen.read_text(encoding="utf-8", errors="replace")
+            text = html.escape(text)
+            return f"<div class=\"attachment\"><pre class=\"code\" style=\"white-space:pre-wrap\">{text}</pre></div>"
+        except Exception:
+            pass
+    return f"<div class=\"attachment\"><a href=\"{rel}\" download>{html.escape(fname)}</a></div>"
+
+
+# One message bubble. Each optional ``*_block`` is either empty or one or
+# more complete lines ending in a newline.
+MESSAGE_TEMPLATE = (
+    "<div class=\"message {side}\">\n"
+    "  <div class=\"bubble\">\n"
+    "{sender_block}"
+    "{body_block}"
+    "{attachments_block}"
+    "{trailer_block}"
+    "    <div class=\"meta\">{meta}</div>\n"
+    "  </div>\n"
+    "</div>"
+)
+
+# Compression level for every gzip-compressed HTML output of the package.
+# Transcripts and the attachment log repeat the same markup on every row and
+# compress several times over; level 6 is gzip's usual speed/size balance
+GZIP_LEVEL = 6
+
+# Number of buffered HTML fragments (roughly one per message) written to
+# disk at a time by render_thread_html
+FLUSH_PARTS = 1024
+
+
+def open_html_output(out_file: Path) -> TextIO:
+    """Open ``out_file`` for writing HTML, gzip-compressed if it ends in ``.gz``.
+
+    Shared by every HTML writer in the package (see :mod:`.attachment_log`)
+    so ``--gzip`` means the same thing everywhere.
+    """
+    if out_file.suffix == ".gz":
+        return gzip.open(out_file, "wt", encoding="utf-8", compresslevel=GZIP_LEVEL)
+    return out_file.open("w", encoding="utf-8", buffering=1 << 20)
+
+
 def render_thread_html(
     messages_root: Path,
     out_file: Path,
@@ -396,161 +712,187 @@ def render_thread_html(
     participants: List[str],
     target_number: str,
     contact_lookup: Callable[[str], str] = lambda x: x,
+    dir_index: Optional[Dict[str, Dict[str, str]]] = None,
 ) -> Tuple[int, int]:
     total = len(msgs)
     with_attachments = 0
 
+    attachment_dir = attachment_dir_builder(messages_root)
+    # Folder listings, from prefetch_attachment_dirs() or filled in here as
+    # folders are first seen; never kept beyond the caller's render
+    if dir_index is None:
+        dir_index = {}
+
+    def listing(dirpath: Path) -> Dict[str, str]:
+        key = str(dirpath)
+        names = dir_index.get(key)
+        if names is None:
+            names = dir_index[key] = _list_dir(key)
+        return names
+
     disp_participants = [contact_lookup(p) for p in participants]
+    # A thread has only a handful of distinct senders; resolve each once
+    sender_names = {s: contact_lookup(s) for s in {m.sender for m in msgs}}
     title = f"Chat – {', '.join(disp_participants)}"
+    title_html = html.escape(title)
 
-    parts: List[str] = []
-    parts.append("<!DOCTYPE html>")
-    parts.append("<html lang=\"en\">")
-    parts.append("<head>")
-    parts.append("<meta charset=\"utf-8\">")
-    parts.append("<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">")
-    parts.append(f"<title>{html.escape(title)}</title>")
-    parts.append("<style>" + CSS_STYLES + "</style>")
-    parts.append("</head>")
-    parts.append("<body>")
-
-    parts.append("<div class=\"header\">")
-    parts.append("  <div class=\"container\">")
-    parts.append(f"    <div><strong>{html.escape(title)}</strong></div>")
-    target_disp = contact_lookup(target_number)
-    meta_line = f"Target: {html.escape(target_disp)}<br>Participants: {html.escape(', '.join(disp_participants))}"
-    parts.append(f"    <div class=\"thread-meta\">{meta_line}</div>")
-    parts.append("    <div class=\"search-bar\"><input id=\"search\" class=\"search-input\" placeholder=\"Search messages\"></div>")
-    parts.append("  </div>")
-    parts.append("</div>")
-
-    parts.append("<div class=\"container\">")
-
-    current_day: Optional[str] = None
+    # Parts are written out in blocks as the thread renders, joined with
+    # newlines exactly as if the whole document were built first
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    with open_html_output(out_file) as fh:
+        parts: List[str] = []
+        parts.append("<!DOCTYPE html>")
+        parts.append("<html lang=\"en\">")
+        parts.append("<head>")
+        parts.append("<meta charset=\"utf-8\">")
+        parts.append("<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">")
+        parts.append(f"<title>{title_html}</title>")
+        parts.append("<style>" + CSS_STYLES + "</style>")
+        parts.append("</head>")
+        parts.append("<body>")
+
+        parts.append("<div class=\"header\">")
+        parts.append("  <div class=\"container\">")
+        parts.append(f"    <div><strong>{title_html}</strong></div>")
+        target_disp = contact_lookup(target_number)
+        meta_line = f"Target: {html.escape(target_disp)}<br>Participants: {html.escape(', '.join(disp_participants))}"
+        parts.append(f"    <div class=\"thread-meta\">{meta_line}</div>")
+        parts.append("    <div class=\"search-bar\"><input id=\"search\" class=\"search-input\" placeholder=\"Search messages\"></div>")
+        parts.append("  </div>")
+        parts.append("</div>")
+
+        parts.append("<div class=\"container\">")
+
+        current_day: Optional[str] = None
+        # Lower-cased text of each .message, in document order, for the search box
+        search_index: List[str] = []
+        # Forwarded media and stickers recur; build each snippet once
+        snippet_cache: Dict[Path, str] = {}
 
-    for m in msgs:
-        # Day divider (based on local date of parsed datetime if available, else raw)
-        day_label = None
-        if m.date_dt:
-            day_label = m.date_dt.astimezone().strftime("%A, %B %d, %Y")
-        elif m.date_raw:
-            # Try to grab just the date part
-            day_label = m.date_raw.split("T")[0]
-        if day_label and day_label != current_day:
-            current_day = day_label
-            parts.append(f"<div class=\"day-divider\">{html.escape(current_day)}</div>")
-
-        side_class = "sent" if m.direction == "out" else "received"
-        parts.append(f"<div class=\"message {side_class}\">")
-        parts.append("  <div class=\"bubble\">")
-
-        sender = safe_text(contact_lookup(m.sender))
-        if sender:
-            parts.append(f"    <div class=\"sender\">{sender}</div>")
-
-        body_html = safe_text(m.body)
-        if body_html:
-            parts.append(f"    <div class=\"body-text\">{body_html}</div>")
-        else:
-            msg_type = (m.msg_type or "").upper()
-            placeholder = (
-                f"NO DATA IN CSV FOR THIS {msg_type} MESSAGE - LOG ONLY" if msg_type else "NO DATA IN CSV FOR THIS MESSAGE - LOG ONLY"
-            )
-            parts.append(f"    <div class=\"body-text missing\">{placeholder}</div>")
-
-        # Attachments
-        attachment_snippets: List[str] = []
-        if m.attachments:
-            for fname in m.attachments:
-                if not fname or fname.lower() in {"null", "null.txt", "none", "(null)", "aaaa"}:
-                    continue
-                if not m.attachment_day:
-                    continue
-                target = build_attachment_path(
-                    messages_root, m.msg_type or "", m.direction or "", m.attachment_day, fname
+        for m in msgs:
+            # Day divider (based on local date of parsed datetime if available, else raw)
+            day_label = None
+            # astimezone() consults the local zone rules on every call; do
+            # it once per message for both the divider and the meta line
+            local_dt = m.date_dt.astimezone() if m.date_dt else None
+            if local_dt:
+                day_label = _day_label(local_dt.date())
+            elif m.date_raw:
+                # Try to grab just the date part
+                day_label = m.date_raw.split("T")[0]
+            if day_label and day_label != current_day:
+                current_day = day_label
+                parts.append(f"<div class=\"day-divider\">{html.escape(current_day)}</div>")
+
+            side_class = "sent" if m.direction == "out" else "received"
+
+            sender = safe_text(sender_names[m.sender])
+            sender_block = f"    <div class=\"sender\">{sender}</div>\n" if sender else ""
+
+            body_html = safe_text(m.body)
+            if body_html:
+                body_block = f"    <div class=\"body-text\">{body_html}</div>\n"
+            else:
+                msg_type = (m.msg_type or "").upper()
+                placeholder = (
+                    f"NO DATA IN CSV FOR THIS {msg_type} MESSAGE - LOG ONLY" if msg_type else "NO DATA IN CSV FOR THIS MESSAGE - LOG ONLY"
                 )
-                if not target.exists():
+                body_block = f"    <div class=\"body-text missing\">{placeholder}</div>\n"
+
+            # Attachments
+            attachment_snippets: List[str] = []
+            attachments_block = ""
+            if m.attachments:
+                for fname in m.attachments:
+                    if not fname or fname.lower() in {"null", "null.txt", "none", "(null)", "aaaa"}:
+                        continue
+                    if not m.attachment_day:
+                        continue
+                    primary_dir = attachment_dir(m.msg_type or "", m.direction or "", m.attachment_day)
                     # Some exports stash attachments without the dated subfolder; check fallback path
-                    alt = messages_root / "attachments" / (m.msg_type or "") / (m.direction or "") / fname
-                    chosen = target if target.exists() else (alt if alt.exists() else None)
-                else:
-                    chosen = target
-
-                if chosen is None:
-                    # Show a small missing-note so you know there *was* an attachment reference
-                    attachment_snippets.append(
-                        f"<div class=\"attachment\"><em class=\"meta\">(missing attachment: {html.escape(fname)})</em></div>"
-                    )
-                    continue
-
-                kind = classify_ext(chosen)
-                rel = relpath_for_html(out_file, chosen)
-                if kind == "image":
-                    attachment_snippets.append(
-                        f"<div class=\"attachment\"><img loading=\"lazy\" src=\"{rel}\" alt=\"{html.escape(fname)}\"></div>"
-                    )
-                elif kind == "video":
-                    attachment_snippets.append(
-                        f"<div class=\"attachment\"><video controls preload=\"metadata\" src=\"{rel}\"></video></div>"
-                    )
-                elif kind == "audio":
-                    attachment_snippets.append(
-                        f"<div class=\"attachment\"><audio controls preload=\"metadata\" src=\"{rel}\"></audio></div>"
-                    )
-                elif kind == "inline_text":
-                    try:
-                        text = chosen.read_text(encoding="utf-8", errors="replace")
-                        text = html.escape(text)
-                        attachment_snippets.append(
-                            f"<div class=\"attachment\"><pre class=\"code\" style=\"white-space:pre-wrap\">{text}</pre></div>"
+                    alt_dir = primary_dir.parent
+                    if "/" in fname or os.sep in fname:
+                        # Names reaching into a subfolder are not in the
+                        # folder listings; ask the filesystem instead
+                        chosen = next(
+                            (d / fname for d in (primary_dir, alt_dir) if (d / fname).exists()), None
                         )
-                    except Exception:
+                    else:
+                        key = _fold_name(fname)
+                        on_disk = listing(primary_dir).get(key)
+                        if on_disk is not None:
+                            chosen = primary_dir / on_disk
+                        else:
+                            on_disk = listing(alt_dir).get(key)
+                            chosen = alt_dir / on_disk if on_disk is not None else None
+
+                    if chosen is None:
+                        # Show a small missing-note so you know there *was* an attachment reference
                         attachment_snippets.append(
-                            f"<div class=\"attachment\"><a href=\"{rel}\" download>{html.escape(fname)}</a></div>"
+                            f"<div class=\"attachment\"><em class=\"meta\">(missing attachment: {html.escape(fname)})</em></div>"
                         )
-                else:
-                    attachment_snippets.append(
-                        f"<div class=\"attachment\"><a href=\"{rel}\" download>{html.escape(fname)}</a></div>"
+                        continue
+
+                    snippet = snippet_cache.get(chosen)
+                    if snippet is None:
+                        snippet = attachment_snippet(out_file, chosen, fname)
+                        # Inline text is read from the file each time rather
+                        # than keeping file contents around
+                        if classify_ext(chosen) != "inline_text":
+                            snippet_cache[chosen] = snippet
+                    attachment_snippets.append(snippet)
+                if attachment_snippets:
+                    with_attachments += 1
+                    attachments_block = "".join(
+                        ["    <div class=\"attachments\">\n"]
+                        + ["      " + s + "\n" for s in attachment_snippets]
+                        + ["    </div>\n"]
                     )
-            if attachment_snippets:
-                with_attachments += 1
-                parts.append("    <div class=\"attachments\">")
-                parts.extend(["      " + s for s in attachment_snippets])
-                parts.append("    </div>")
-
-        msg_type = (m.msg_type or "unknown").upper()
-        if msg_type == "MMS" and not attachment_snippets:
-            parts.append(
-                f"    <div class=\"body-text missing\">NO {msg_type} ATTACHMENT AVAILABLE - LOG ONLY</div>"
-            )
 
-        # Meta line
-        if m.date_dt:
-            local_str = m.date_dt.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
-            parts.append(
-                f"    <div class=\"meta\">{html.escape(local_str)} · {html.escape(m.direction)} · {html.escape(m.msg_type)}</div>"
-            )
-        else:
-            parts.append(
-                f"    <div class=\"meta\">{html.escape(m.date_raw)} · {html.escape(m.direction)} · {html.escape(m.msg_type)}</div>"
-            )
-
-        parts.append("  </div>")  # bubble
-        parts.append("</div>")    # message
-
-    parts.append("</div>")  # container
-
-    parts.append("<div class=\"footer\">")
-    parts.append("  <div class=\"container\">Return to <a href=\"index.html\">index</a></div>")
-    parts.append("</div>")
-    parts.append("<script>")
-    parts.append("const s=document.getElementById('search');")
-    parts.append("s&&s.addEventListener('input',e=>{const q=e.target.value.toLowerCase();document.querySelectorAll('.message').forEach(m=>{m.style.display=m.textContent.toLowerCase().includes(q)?'':'none';});});")
-    parts.append("</script>")
-    parts.append("</body></html>")
+            msg_type = (m.msg_type or "unknown").upper()
+            if msg_type == "MMS" and not attachment_snippets:
+                trailer_block = f"    <div class=\"body-text missing\">NO {msg_type} ATTACHMENT AVAILABLE - LOG ONLY</div>\n"
+            else:
+                trailer_block = ""
 
-    out_file.parent.mkdir(parents=True, exist_ok=True)
-    out_file.write_text("\n".join(parts), encoding="utf-8")
+            # Meta line
+            if local_dt:
+                when = local_dt.strftime("%Y-%m-%d %H:%M:%S %Z")
+            else:
+                when = m.date_raw
+            meta = f"{safe_text(when)} · {_escape_token(m.direction)} · {_escape_token(m.msg_type)}"
+
+            message_html = MESSAGE_TEMPLATE.format(
+                side=side_class,
+                sender_block=sender_block,
+                body_block=body_block,
+                attachments_block=attachments_block,
+                trailer_block=trailer_block,
+                meta=meta,
+            )
+            parts.append(message_html)
+            search_index.append(search_text(message_html))
+
+            # Hand finished messages to the file every so often so a long
+            # thread never sits in memory as one document
+            if len(parts) >= FLUSH_PARTS:
+                fh.write("\n".join(parts))
+                fh.write("\n")
+                parts.clear()
+
+        parts.append("</div>")  # container
+
+        parts.append("<div class=\"footer\">")
+        parts.append("  <div class=\"container\">Return to <a href=\"index.html\">index</a></div>")
+        parts.append("</div>")
+        parts.append("<script>")
+        # "<" is escaped so message text can never close the script element
+        parts.append("const IDX=" + json.dumps(search_index, ensure_ascii=False).replace("<", "\\u003c") + ";")
+        parts.append(THREAD_SEARCH_JS)
+        parts.append("</script>")
+        parts.append("</body></html>")
+
+        fh.write("\n".join(parts))
 
     return total, with_attachments
 
@@ -587,7 +929,8 @@ def write_index(out_dir: Path, entries: List[Tuple[str, str, int, int]]):
 
 # ------------------------- Main -------------------------
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point; ``argv`` defaults to ``sys.argv[1:]``."""
     ap = argparse.ArgumentParser(description="Render chat transcripts from CSVs into HTML.")
     ap.add_argument("--in", dest="in_dir", required=True, help="Input root folder (expects CSVs inside, plus attachments/...) e.g. messages")
     ap.add_argument("--out", dest="out_dir", required=True, help="Output folder for HTML transcripts, e.g. transcripts")
@@ -598,7 +941,14 @@ def main():
         default="",
         help="Path to Excel file mapping phone numbers to contacts",
     )
-    args = ap.parse_args()
+    ap.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Write chats as .html.gz (for serving over HTTP; browsers won't open them from disk)",
+    )
+    args = ap.parse_args(argv)
+    # The GUI calls main() repeatedly; don't carry dates over between runs
+    parse_csv_date.cache_clear()
 
     target = args.target_number
     lookup = build_contact_lookup(args.contacts_xlsx)
@@ -615,8 +965,12 @@ def main():
     all_msgs: List[Message] = []
     call_records: List[Message] = []
 
-    for csv_file in csv_files:
-        msgs = load_messages_from_csv(csv_file, lookup)
+    # Each CSV parses independently; the pyarrow reader and file IO release
+    # the GIL, so threads overlap the loads. map() keeps the file order.
+    with ThreadPoolExecutor() as executor:
+        loaded = list(executor.map(functools.partial(load_messages_from_csv, contact_lookup=lookup), csv_files))
+
+    for msgs in loaded:
         for m in msgs:
             if m.msg_type == "call":
                 if not m.sender:
@@ -628,14 +982,15 @@ def main():
                 all_msgs.append(m)
 
     grouped = group_messages_by_chat(all_msgs, target)
+    dir_index = prefetch_attachment_dirs(messages_root, all_msgs)
 
     index_entries: List[Tuple[str, str, int, int]] = []
     for participants, msgs in grouped.items():
         title = f"Chat – {', '.join(participants)}"
         key = sanitize_participants(participants)
-        out_file = out_root / f"chat-{key}.html"
+        out_file = out_root / f"chat-{key}.html{'.gz' if args.gzip else ''}"
         total, with_attachments = render_thread_html(
-            messages_root, out_file, msgs, list(participants), target, lookup
+            messages_root, out_file, msgs, list(participants), target, lookup, dir_index
         )
         rel = os.path.relpath(out_file, start=out_root).replace(os.sep, "/")
         index_entries.append((title, rel, total, with_attachments))
@@ -646,15 +1001,17 @@ def main():
     from openpyxl import Workbook
 
     call_log_path = out_root / "Call Log.xlsx"
-    wb = Workbook()
-    ws = wb.active
-    ws.append(["Date", "Direction", "Sender", "Recipients", "Message ID"])
+    # Write-only mode streams rows into the file instead of keeping a Cell
+    # object per value
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Sheet")
+    ws.append(("Date", "Direction", "Sender", "Recipients", "Message ID"))
     for m in call_records:
         if m.date_dt:
             date_str = m.date_dt.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
         else:
             date_str = m.date_raw
-        ws.append([date_str, m.direction, m.sender, m.recipients, m.message_id])
+        ws.append((date_str, m.direction, m.sender, m.recipients, m.message_id))
     wb.save(call_log_path)
 
     print(f"\nDone. Open: {out_root / 'index.html'}")
@@ -13,8 +13,7 @@ Tabs provided:
 * **Contacts to Excel** – wraps ``contacts_to_excel.convert_contacts``.
 * **Render Transcripts** – wraps ``render_transcripts.main`` and includes
   an entry for the target phone number.
-* **Collect Attachments** – wraps ``collect_attachments.collect_attachments``
-  and ``collect_attachments.write_excel``.
+* **Collect Attachments** – wraps ``collect_attachments.collect_and_log``.
 * **Collect Quarantined Files** – wraps
   ``collect_quarantined_files.collect_quarantined_files``.
 
@@ -27,9 +26,10 @@ pyinstaller --onefile synchronoss_parser/toolbox_gui.py
 
 from __future__ import annotations
 
-import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 import tkinter as tk
 from tkinter import filedialog, ttk
 
@@ -43,13 +43,67 @@ from synchronoss_parser import decrypt_unzip
 from synchronoss_parser.utils import normalize_phone_number
 
 
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+# Longest joined list of file names, in characters, shown inline in a
+# status message
+STATUS_LIST_MAX = 500
+
+# Set once the main window is closing; results of jobs still running are
+# then dropped instead of being scheduled on a destroyed Tk interpreter
+_closing = threading.Event()
+
+
+def _finish(frame: tk.Misc, status_var: tk.StringVar, progress: ttk.Progressbar, msg: str) -> None:
+    """Show ``msg`` and stop ``progress`` once Tk is idle.
+
+    Called from worker threads. ``msg`` must already be formatted: it is
+    bound now, so the callback never reads variables the worker has since
+    changed or (like an ``except`` target) deleted.
+    """
+    if _closing.is_set():
+        return
+    frame.after_idle(lambda: (status_var.set(msg), progress.stop()))
+
+
+def _submit(
+    executor: ThreadPoolExecutor,
+    button: ttk.Button,
+    task: Callable[[], None],
+    on_done: Callable[[], None] | None = None,
+) -> None:
+    """Run ``task`` on ``executor``, keeping ``button`` disabled until it ends.
+
+    Each tab has its own single-worker executor, so its jobs run off the Tk
+    thread one at a time; the disabled button stops a second one being
+    queued while the first runs. When the job ends ``on_done`` is called on
+    the Tk thread; by default it re-enables ``button``.
+    """
+
+    def finished() -> None:
+        if on_done is None:
+            button.state(["!disabled"])
+        else:
+            on_done()
+
+    def done(_) -> None:
+        if not _closing.is_set():
+            button.after_idle(finished)
+
+    button.state(["disabled"])
+    future = executor.submit(task)
+    future.add_done_callback(done)
+
+
 # ---------------------------------------------------------------------------
 # Tab builders
 # ---------------------------------------------------------------------------
 
 
-def build_collect_media_tab(nb: ttk.Notebook) -> None:
-    """Add the Collect Media UI to ``nb``."""
+def build_collect_media_tab(nb: ttk.Notebook) -> ThreadPoolExecutor:
+    """Add the Collect Media UI to ``nb`` and return its executor."""
 
     frame = ttk.Frame(nb)
     nb.add(frame, text="Collect Media")
@@ -59,6 +113,7 @@ def build_collect_media_tab(nb: ttk.Notebook) -> None:
     status_var = tk.StringVar()
     contacts_var = tk.StringVar()
     progress = ttk.Progressbar(frame, mode="indeterminate")
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="collect-media")
 
     def browse_in() -> None:
         path = filedialog.askdirectory(initialdir=in_var.get() or ".")
@@ -86,30 +141,27 @@ def build_collect_media_tab(nb: ttk.Notebook) -> None:
             compiled_path = Path(out_var.get()).expanduser()
 
             if not root_path.exists():
-                frame.after(
-                    0,
-                    lambda: [
-                        status_var.set(f"Input folder '{root_path}' does not exist."),
-                        progress.stop(),
-                    ],
+                _finish(
+                    frame,
+                    status_var,
+                    progress,
+                    f"Input folder '{root_path}' does not exist.",
                 )
                 return
 
+            logfile = compiled_path / "compiled_media_log" / "compiled_media_log.xlsx"
+            # Creating the log folder creates the output folder with it
             try:
-                compiled_path.mkdir(parents=True, exist_ok=True)
+                logfile.parent.mkdir(parents=True, exist_ok=True)
             except Exception as e:
-                frame.after(
-                    0,
-                    lambda: [
-                        status_var.set(
-                            f"Could not create output folder '{compiled_path}': {e}"
-                        ),
-                        progress.stop(),
-                    ],
+                _finish(
+                    frame,
+                    status_var,
+                    progress,
+                    f"Could not create output folder '{compiled_path}': {e}",
                 )
                 return
 
-            logfile = compiled_path / "compiled_media_log" / "compiled_media_log.xlsx"
             try:
                 records, exif_keys = cm.collect_media(root_path, compiled_path)
                 cm.write_excel(records, exif_keys, logfile)
@@ -120,9 +172,9 @@ def build_collect_media_tab(nb: ttk.Notebook) -> None:
             except Exception as e:  # pragma: no cover - user feedback
                 msg = f"Error: {e}"
 
-            frame.after(0, lambda: [status_var.set(msg), progress.stop()])
+            _finish(frame, status_var, progress, msg)
 
-        threading.Thread(target=task, daemon=True).start()
+        _submit(executor, run_button, task)
 
     ttk.Label(frame, text="'VZMOBILE' Folder Path:").grid(
         row=0, column=0, sticky="e", padx=5, pady=5
@@ -154,7 +206,8 @@ def build_collect_media_tab(nb: ttk.Notebook) -> None:
         row=2, column=2, padx=5, pady=5
     )
 
-    ttk.Button(frame, text="Run", command=run).grid(row=3, column=1, pady=10)
+    run_button = ttk.Button(frame, text="Run", command=run)
+    run_button.grid(row=3, column=1, pady=10)
 
     progress.grid(row=4, column=0, columnspan=3, sticky="ew", padx=5)
 
@@ -162,9 +215,11 @@ def build_collect_media_tab(nb: ttk.Notebook) -> None:
         row=5, column=0, columnspan=3, padx=5, pady=5
     )
 
+    return executor
+
 
-def build_contacts_tab(nb: ttk.Notebook) -> None:
-    """Add the Contacts to Excel UI to ``nb``."""
+def build_contacts_tab(nb: ttk.Notebook) -> ThreadPoolExecutor:
+    """Add the Contacts to Excel UI to ``nb`` and return its executor."""
 
     frame = ttk.Frame(nb)
     nb.add(frame, text="Contacts to Excel")
@@ -173,6 +228,7 @@ def build_contacts_tab(nb: ttk.Notebook) -> None:
     out_var = tk.StringVar()
     status_var = tk.StringVar()
     progress = ttk.Progressbar(frame, mode="indeterminate")
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="contacts")
 
     def browse_in() -> None:
         path = filedialog.askopenfilename(
@@ -202,9 +258,9 @@ def build_contacts_tab(nb: ttk.Notebook) -> None:
             except Exception as e:  # pragma: no cover - user feedback
                 msg = f"Error: {e}"
 
-            frame.after(0, lambda: [status_var.set(msg), progress.stop()])
+            _finish(frame, status_var, progress, msg)
 
-        threading.Thread(target=task, daemon=True).start()
+        _submit(executor, run_button, task)
 
     ttk.Label(frame, text="'contacts.txt' File Path:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
     ttk.Entry(frame, textvariable=in_var, width=50).grid(row=0, column=1, padx=5, pady=5)
@@ -214,7 +270,8 @@ def build_contacts_tab(nb: ttk.Notebook) -> None:
     ttk.Entry(frame, textvariable=out_var, width=50).grid(row=1, column=1, padx=5, pady=5)
     ttk.Button(frame, text="Save As", command=browse_out).grid(row=1, column=2, padx=5, pady=5)
 
-    ttk.Button(frame, text="Convert", command=convert).grid(row=2, column=1, pady=10)
+    run_button = ttk.Button(frame, text="Convert", command=convert)
+    run_button.grid(row=2, column=1, pady=10)
 
     progress.grid(row=3, column=0, columnspan=3, sticky="ew", padx=5)
 
@@ -222,14 +279,16 @@ def build_contacts_tab(nb: ttk.Notebook) -> None:
         row=4, column=0, columnspan=3, padx=5, pady=5
     )
 
+    return executor
 
-def build_render_tab(nb: ttk.Notebook) -> None:
-    """Add the Render Transcripts UI to ``nb``.
+
+def build_render_tab(nb: ttk.Notebook) -> ThreadPoolExecutor:
+    """Add the Render Transcripts UI to ``nb`` and return its executor.
 
     Allows the user to specify the target phone number whose messages should
     be labeled in the transcript output. The phone number may include common
     formatting characters (``+``, spaces, dashes); these are stripped before
-    validation.
+    validation. The Render button stays disabled until the number is valid.
     """
 
     frame = ttk.Frame(nb)
@@ -241,6 +300,7 @@ def build_render_tab(nb: ttk.Notebook) -> None:
     target_var = tk.StringVar()
     status_var = tk.StringVar()
     progress = ttk.Progressbar(frame, mode="indeterminate")
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
 
     def browse_in() -> None:
         path = filedialog.askdirectory(initialdir=in_var.get() or ".")
@@ -260,9 +320,34 @@ def build_render_tab(nb: ttk.Notebook) -> None:
         if path:
             contacts_var.set(path)
 
+    # Normalised form of the last target text seen, refreshed as the user
+    # types so render() does not normalise it again
+    last_raw: str | None = None
+    last_target = ""
+    running = False
+
+    def update_run_button() -> None:
+        ready = not running and len(last_target) == 11
+        run_button.state(["!disabled" if ready else "disabled"])
+
+    def on_target_change(*_args) -> None:
+        nonlocal last_raw, last_target
+        raw = target_var.get().strip()
+        if raw == last_raw:
+            return
+        last_raw = raw
+        last_target = normalize_phone_number(raw)
+        update_run_button()
+
+    def on_done() -> None:
+        nonlocal running
+        running = False
+        update_run_button()
+
     def render() -> None:
-        raw_target = target_var.get().strip()
-        target = normalize_phone_number(raw_target)
+        nonlocal running
+        on_target_change()
+        target = last_target
         if len(target) != 11:
             status_var.set(
                 "Target phone number must be 11 digits after removing formatting."
@@ -270,7 +355,7 @@ def build_render_tab(nb: ttk.Notebook) -> None:
             return
 
         contacts_path = Path(contacts_var.get()).expanduser()
-        if not (contacts_var.get() and contacts_path.is_file()):
+        if not contacts_var.get():
             status_var.set(f"Contacts file '{contacts_path}' does not exist.")
             return
 
@@ -278,29 +363,35 @@ def build_render_tab(nb: ttk.Notebook) -> None:
         status_var.set("Rendering...")
 
         def task() -> None:
-            old_argv = sys.argv[:]
+            # Checked here rather than on the Tk thread, where a stat on a
+            # slow network share would freeze the window
+            if not contacts_path.is_file():
+                _finish(frame, status_var, progress, f"Contacts file '{contacts_path}' does not exist.")
+                return
+
             try:
-                sys.argv = [
-                    "render-transcripts",
-                    "--in",
-                    in_var.get(),
-                    "--out",
-                    out_var.get(),
-                    "--target-number",
-                    target,
-                    "--contacts-xlsx",
-                    contacts_path.as_posix(),
-                ]
-                rt.main()
+                # Arguments are passed directly; sys.argv is shared by
+                # every thread and must not be swapped from a worker
+                rt.main(
+                    [
+                        "--in",
+                        in_var.get(),
+                        "--out",
+                        out_var.get(),
+                        "--target-number",
+                        target,
+                        "--contacts-xlsx",
+                        contacts_path.as_posix(),
+                    ]
+                )
                 msg = f"Rendered transcripts to '{out_var.get()}'"
             except Exception as e:  # pragma: no cover - user feedback
                 msg = f"Error: {e}"
-            finally:
-                sys.argv = old_argv
 
-            frame.after(0, lambda: [status_var.set(msg), progress.stop()])
+            _finish(frame, status_var, progress, msg)
 
-        threading.Thread(target=task, daemon=True).start()
+        running = True
+        _submit(executor, run_button, task, on_done)
 
     ttk.Label(frame, text="Input folder:").grid(
         row=0, column=0, sticky="e", padx=5, pady=5
@@ -340,7 +431,10 @@ def build_render_tab(nb: ttk.Notebook) -> None:
         row=3, column=1, padx=5, pady=5, sticky="w"
     )
 
-    ttk.Button(frame, text="Render", command=render).grid(row=4, column=1, pady=10)
+    run_button = ttk.Button(frame, text="Render", command=render)
+    run_button.grid(row=4, column=1, pady=10)
+    target_var.trace_add("write", on_target_change)
+    on_target_change()
 
     progress.grid(row=5, column=0, columnspan=3, sticky="ew", padx=5)
 
@@ -353,9 +447,11 @@ def build_render_tab(nb: ttk.Notebook) -> None:
 # Collect attachments tab
 # ---------------------------------------------------------------------------
 
+    return executor
 
-def build_collect_attachments_tab(nb: ttk.Notebook) -> None:
-    """Add the Collect Attachments UI to ``nb``."""
+
+def build_collect_attachments_tab(nb: ttk.Notebook) -> ThreadPoolExecutor:
+    """Add the Collect Attachments UI to ``nb`` and return its executor."""
 
     frame = ttk.Frame(nb)
     nb.add(frame, text="Collect Attachments")
@@ -365,6 +461,7 @@ def build_collect_attachments_tab(nb: ttk.Notebook) -> None:
     contacts_var = tk.StringVar()
     status_var = tk.StringVar()
     progress = ttk.Progressbar(frame, mode="indeterminate")
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="collect-attachments")
 
     def browse_attachments() -> None:
         path = filedialog.askdirectory(initialdir=attachments_var.get() or ".")
@@ -392,28 +489,11 @@ def build_collect_attachments_tab(nb: ttk.Notebook) -> None:
             compiled_path = Path(out_var.get()).expanduser()
 
             if not attachments_root.exists():
-                frame.after(
-                    0,
-                    lambda: [
-                        status_var.set(
-                            f"Attachments folder '{attachments_root}' does not exist."
-                        ),
-                        progress.stop(),
-                    ],
-                )
-                return
-
-            try:
-                compiled_path.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                frame.after(
-                    0,
-                    lambda: [
-                        status_var.set(
-                            f"Could not create output folder '{compiled_path}': {e}"
-                        ),
-                        progress.stop(),
-                    ],
+                _finish(
+                    frame,
+                    status_var,
+                    progress,
+                    f"Attachments folder '{attachments_root}' does not exist.",
                 )
                 return
 
@@ -422,22 +502,33 @@ def build_collect_attachments_tab(nb: ttk.Notebook) -> None:
                 / "compiled_attachment_log"
                 / "compiled_attachment_log.xlsx"
             )
+            # Creating the log folder creates the output folder with it
+            try:
+                logfile.parent.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                _finish(
+                    frame,
+                    status_var,
+                    progress,
+                    f"Could not create output folder '{compiled_path}': {e}",
+                )
+                return
+
             contacts_path = contacts_var.get() or None
             try:
-                records, exif_keys = ca.collect_attachments(
-                    attachments_root, compiled_path, contacts_path
+                count = ca.collect_and_log(
+                    attachments_root, compiled_path, contacts_path, logfile
                 )
-                ca.write_excel(records, exif_keys, logfile)
                 msg = (
-                    f"Copied {len(records)} files from '{attachments_root}' to '{compiled_path}' and "
+                    f"Copied {count} files from '{attachments_root}' to '{compiled_path}' and "
                     f"logged to '{logfile}'."
                 )
             except Exception as e:  # pragma: no cover - user feedback
                 msg = f"Error: {e}"
 
-            frame.after(0, lambda: [status_var.set(msg), progress.stop()])
+            _finish(frame, status_var, progress, msg)
 
-        threading.Thread(target=task, daemon=True).start()
+        _submit(executor, run_button, task)
 
     ttk.Label(frame, text="Attachments folder:").grid(
         row=0, column=0, sticky="e", padx=5, pady=5
@@ -469,7 +560,8 @@ def build_collect_attachments_tab(nb: ttk.Notebook) -> None:
         row=2, column=2, padx=5, pady=5
     )
 
-    ttk.Button(frame, text="Run", command=run).grid(row=3, column=1, pady=10)
+    run_button = ttk.Button(frame, text="Run", command=run)
+    run_button.grid(row=3, column=1, pady=10)
 
     progress.grid(row=4, column=0, columnspan=3, sticky="ew", padx=5)
 
@@ -482,9 +574,11 @@ def build_collect_attachments_tab(nb: ttk.Notebook) -> None:
 # Collect quarantined files tab
 # ---------------------------------------------------------------------------
 
+    return executor
+
 
-def build_collect_quarantine_tab(nb: ttk.Notebook) -> None:
-    """Add the Collect Quarantined Files UI to ``nb``."""
+def build_collect_quarantine_tab(nb: ttk.Notebook) -> ThreadPoolExecutor:
+    """Add the Collect Quarantined Files UI to ``nb`` and return its executor."""
 
     frame = ttk.Frame(nb)
     nb.add(frame, text="Collect Quarantine Files")
@@ -493,6 +587,7 @@ def build_collect_quarantine_tab(nb: ttk.Notebook) -> None:
     out_var = tk.StringVar()
     status_var = tk.StringVar()
     progress = ttk.Progressbar(frame, mode="indeterminate")
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="collect-quarantine")
 
     def browse_root() -> None:
         path = filedialog.askdirectory(initialdir=root_var.get() or ".")
@@ -512,26 +607,22 @@ def build_collect_quarantine_tab(nb: ttk.Notebook) -> None:
             compiled_path = Path(out_var.get()).expanduser()
 
             if not root_path.exists():
-                frame.after(
-                    0,
-                    lambda: [
-                        status_var.set(f"Root folder '{root_path}' does not exist."),
-                        progress.stop(),
-                    ],
+                _finish(
+                    frame,
+                    status_var,
+                    progress,
+                    f"Root folder '{root_path}' does not exist.",
                 )
                 return
 
             try:
                 compiled_path.mkdir(parents=True, exist_ok=True)
             except Exception as e:
-                frame.after(
-                    0,
-                    lambda: [
-                        status_var.set(
-                            f"Could not create output folder '{compiled_path}': {e}"
-                        ),
-                        progress.stop(),
-                    ],
+                _finish(
+                    frame,
+                    status_var,
+                    progress,
+                    f"Could not create output folder '{compiled_path}': {e}",
                 )
                 return
 
@@ -541,18 +632,32 @@ def build_collect_quarantine_tab(nb: ttk.Notebook) -> None:
                         root_path, compiled_path
                     )
                 )
-                msg = (
-                    f"Converted {len(copied)} of {total} files from '{root_path}' to '{compiled_path}'."
-                )
-                if skipped:
-                    skipped_str = ", ".join(str(p) for p in skipped)
-                    msg += f" Skipped {len(skipped)} files: {skipped_str}."
             except Exception as e:  # pragma: no cover - user feedback
-                msg = f"Error: {e}"
-
-            frame.after(0, lambda: [status_var.set(msg), progress.stop()])
+                _finish(frame, status_var, progress, f"Error: {e}")
+                return
 
-        threading.Thread(target=task, daemon=True).start()
+            msg = (
+                f"Converted {len(copied)} of {total} files from '{root_path}' to '{compiled_path}'."
+            )
+            if skipped:
+                skipped_str = ", ".join(str(p) for p in skipped)
+                if len(skipped_str) <= STATUS_LIST_MAX:
+                    msg += f" Skipped {len(skipped)} files: {skipped_str}."
+                else:
+                    # A long list makes the status label unreadable and
+                    # costly to hand to Tcl; keep it in a file instead
+                    skipped_file = compiled_path / "skipped.txt"
+                    try:
+                        skipped_file.write_text(
+                            "".join(f"{p}\n" for p in skipped), encoding="utf-8"
+                        )
+                        msg += f" Skipped {len(skipped)} files, listed in '{skipped_file}'."
+                    except OSError as e:
+                        msg += f" Skipped {len(skipped)} files; could not list them in '{skipped_file}': {e}."
+
+            _finish(frame, status_var, progress, msg)
+
+        _submit(executor, run_button, task)
 
     ttk.Label(frame, text="Root folder:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
     ttk.Entry(frame, textvariable=root_var, width=50).grid(row=0, column=1, padx=5, pady=5)
@@ -562,7 +667,8 @@ def build_collect_quarantine_tab(nb: ttk.Notebook) -> None:
     ttk.Entry(frame, textvariable=out_var, width=50).grid(row=1, column=1, padx=5, pady=5)
     ttk.Button(frame, text="Browse", command=browse_out).grid(row=1, column=2, padx=5, pady=5)
 
-    ttk.Button(frame, text="Run", command=run).grid(row=2, column=1, pady=10)
+    run_button = ttk.Button(frame, text="Run", command=run)
+    run_button.grid(row=2, column=1, pady=10)
 
     progress.grid(row=3, column=0, columnspan=3, sticky="ew", padx=5)
 
@@ -575,9 +681,11 @@ def build_collect_quarantine_tab(nb: ttk.Notebook) -> None:
 # Decrypt/unzip tab
 # ---------------------------------------------------------------------------
 
+    return executor
+
 
-def build_decrypt_unzip_tab(nb: ttk.Notebook) -> None:
-    """Add the Decrypt & Unzip UI to ``nb``."""
+def build_decrypt_unzip_tab(nb: ttk.Notebook) -> ThreadPoolExecutor:
+    """Add the Decrypt & Unzip UI to ``nb`` and return its executor."""
 
     frame = ttk.Frame(nb)
     nb.add(frame, text="Decrypt & Unzip")
@@ -587,6 +695,7 @@ def build_decrypt_unzip_tab(nb: ttk.Notebook) -> None:
     password_var = tk.StringVar()
     status_var = tk.StringVar()
     progress = ttk.Progressbar(frame, mode="indeterminate")
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="decrypt-unzip")
 
     def browse_archive() -> None:
         path = filedialog.askopenfilename(
@@ -607,13 +716,9 @@ def build_decrypt_unzip_tab(nb: ttk.Notebook) -> None:
 
         def task() -> None:
             archive = Path(archive_var.get()).expanduser()
-            out_dir = Path(output_var.get()).expanduser() if output_var.get() else None
+            output = output_var.get()
+            output_dir = Path(output).expanduser() if output else None
             try:
-
-                archive = Path(archive_var.get()).expanduser()
-                output_dir = (
-                    Path(output_var.get()).expanduser() if output_var.get() else None
-                )
                 decrypt_unzip.decrypt_and_unzip(
                     archive, password_var.get(), output_dir
                 )
@@ -623,9 +728,9 @@ def build_decrypt_unzip_tab(nb: ttk.Notebook) -> None:
             except Exception as e:  # pragma: no cover - user feedback
                 msg = f"Error: {e}"
 
-            frame.after(0, lambda: [status_var.set(msg), progress.stop()])
+            _finish(frame, status_var, progress, msg)
 
-        threading.Thread(target=task, daemon=True).start()
+        _submit(executor, run_button, task)
 
     ttk.Label(frame, text="Encrypted archive:").grid(
         row=0, column=0, sticky="e", padx=5, pady=5
@@ -654,7 +759,8 @@ def build_decrypt_unzip_tab(nb: ttk.Notebook) -> None:
         row=2, column=1, padx=5, pady=5, sticky="w"
     )
 
-    ttk.Button(frame, text="Run", command=run).grid(row=3, column=1, pady=10)
+    run_button = ttk.Button(frame, text="Run", command=run)
+    run_button.grid(row=3, column=1, pady=10)
 
     progress.grid(row=4, column=0, columnspan=3, sticky="ew", padx=5)
 
@@ -667,6 +773,8 @@ def build_decrypt_unzip_tab(nb: ttk.Notebook) -> None:
 # Main application
 # ---------------------------------------------------------------------------
 
+    return executor
+
 
 def main() -> None:  # pragma: no cover - GUI entry point
     root = tk.Tk()
@@ -675,13 +783,24 @@ def main() -> None:  # pragma: no cover - GUI entry point
     notebook = ttk.Notebook(root)
     notebook.pack(fill="both", expand=True)
 
-    build_collect_media_tab(notebook)
-    build_contacts_tab(notebook)
-    build_render_tab(notebook)
-    build_collect_attachments_tab(notebook)
-    build_collect_quarantine_tab(notebook)
-    build_decrypt_unzip_tab(notebook)
-
+    executors = [
+        build_collect_media_tab(notebook),
+        build_contacts_tab(notebook),
+        build_render_tab(notebook),
+        build_collect_attachments_tab(notebook),
+        build_collect_quarantine_tab(notebook),
+        build_decrypt_unzip_tab(notebook),
+    ]
+
+    def on_close() -> None:
+        # Queued jobs are cancelled; a running one cannot be interrupted and
+        # finishes in the background without touching the closed window
+        _closing.set()
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
 
@@ -0,0 +1,59 @@
+import gzip
+
+from PIL import Image
+from openpyxl import load_workbook
+
+from synchronoss_parser.attachment_log import generate_log
+
+
+def test_generate_log_writes_excel_and_html(tmp_path):
+    messages = tmp_path / "messages"
+    day_dir = messages / "attachments" / "mms" / "in" / "2024-01-01"
+    day_dir.mkdir(parents=True)
+    Image.new("RGB", (10, 10), color="red").save(day_dir / "a.jpg")
+    (day_dir / "b.txt").write_text("not an image")
+
+    (messages / "20240101.csv").write_text(
+        "Date,Type,Direction,Attachments,Body,Sender,Recipients,\"Message ID\"\n"
+        "2024-01-01T00:00:00Z,mms,in,a.jpg;b.txt,Hi,111,<222>,id1\n"
+    )
+
+    out_dir = tmp_path / "Attachment Log"
+    generate_log(messages, out_dir)
+
+    ws = load_workbook(out_dir / "attachment_log.xlsx").active
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows == [
+        ("filename", "sender", "recipient"),
+        ("a.jpg", "111", "<222>"),
+        ("b.txt", "111", "<222>"),
+    ]
+
+    html = (out_dir / "attachment_log.html").read_text(encoding="utf-8")
+    assert (
+        '<tr><td><a href="../messages/attachments/mms/in/2024-01-01/a.jpg">a.jpg</a></td>'
+        "<td>111</td><td>&lt;222&gt;</td>"
+        '<td><img src="thumbnails/mms/in/2024-01-01/a.jpg" /></td></tr>'
+    ) in html
+    assert (
+        '<a href="../messages/attachments/mms/in/2024-01-01/b.txt">b.txt</a>'
+        "</td><td>111</td><td>&lt;222&gt;</td><td></td></tr>"
+    ) in html
+    assert (out_dir / "thumbnails" / "mms" / "in" / "2024-01-01" / "a.jpg").exists()
+
+
+def test_generate_log_compressed_html(tmp_path):
+    messages = tmp_path / "messages"
+    messages.mkdir()
+    (messages / "20240101.csv").write_text(
+        "Date,Type,Direction,Attachments,Body,Sender,Recipients,\"Message ID\"\n"
+        "2024-01-01T00:00:00Z,mms,in,a.jpg,Hi,111,222,id1\n"
+    )
+
+    out_dir = tmp_path / "Attachment Log"
+    generate_log(messages, out_dir, gzip_output=True)
+
+    assert not (out_dir / "attachment_log.html").exists()
+    html = gzip.decompress((out_dir / "attachment_log.html.gz").read_bytes()).decode("utf-8")
+    assert html.startswith("<table>\n")
+    assert ">a.jpg</a></td><td>111</td><td>222</td><td></td></tr>" in html
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+
+from synchronoss_parser.render_transcripts import classify_ext
+
+
+@pytest.mark.parametrize(
+    "name, kind",
+    [
+        ("photo.JPG", "image"),
+        ("clip.mov", "video"),
+        ("clip.ogg", "video"),
+        ("voice.m4a", "audio"),
+        ("card.vcf", "inline_text"),
+        ("doc.pdf", "other"),
+        ("noext", "other"),
+    ],
+)
+def test_classify_ext(name, kind):
+    assert classify_ext(Path(name)) == kind
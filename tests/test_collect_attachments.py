@@ -1,22 +1,13 @@
-import importlib
 import hashlib
-import sys
-from pathlib import Path
 
 import pandas as pd
 from PIL import Image
 from openpyxl import load_workbook
 
-
-def load_module():
-    project_root = Path(__file__).resolve().parents[1]
-    sys.path.append(str(project_root))
-    return importlib.import_module("synchronoss_parser.collect_attachments")
+from synchronoss_parser import collect_attachments
 
 
 def test_collect_attachments_copies_files_and_logs_metadata(tmp_path):
-    collect_attachments = load_module()
-
     messages_dir = tmp_path / "messages"
     attachments_dir = messages_dir / "attachments" / "mms" / "in" / "2024-01-01"
     attachments_dir.mkdir(parents=True)
@@ -91,8 +82,6 @@ def test_collect_attachments_copies_files_and_logs_metadata(tmp_path):
 
 
 def test_duplicate_filenames_same_message(tmp_path):
-    collect_attachments = load_module()
-
     messages_dir = tmp_path / "messages"
     messages_dir.mkdir()
 
@@ -119,3 +108,51 @@ def test_duplicate_filenames_same_message(tmp_path):
     ]
 
     assert len(list(compiled.glob("*.jpg"))) == 2
+
+
+def test_sanitize_filename_component_strips_unsafe_characters():
+    raw = 'a<b>c:"d/e\\f|g?h*i\x00\x1fj. '
+    assert collect_attachments.sanitize_filename_component(raw) == "abcdefghij"
+    assert collect_attachments.sanitize_filename_component(" Bob Jones. ") == "Bob Jones"
+
+
+def test_collect_and_log_streams_rows(tmp_path, monkeypatch):
+    messages_dir = tmp_path / "messages"
+    attachments_dir = messages_dir / "attachments" / "mms" / "in" / "2024-01-01"
+    attachments_dir.mkdir(parents=True)
+
+    img = Image.new("RGB", (10, 10), color="red")
+    exif = img.getexif()
+    exif[274] = 1  # Orientation tag
+    img.save(attachments_dir / "photo.jpg", exif=exif)
+    (attachments_dir / "clip.mp4").write_bytes(b"\x00\x00\x00\x18ftypmp42")
+
+    (messages_dir / "20240101.csv").write_text(
+        "Date,Type,Direction,Attachments,Body,Sender,Recipients,\"Message ID\"\n"
+        "2024-01-01T00:00:00Z,mms,in,photo.jpg;clip.mp4,Hi,Alice,Bob,id1\n"
+    )
+
+    calls = []
+    extract_exif = collect_attachments.extract_exif
+    monkeypatch.setattr(
+        collect_attachments, "extract_exif", lambda path: calls.append(path) or extract_exif(path)
+    )
+
+    compiled = tmp_path / "Compiled Attachments"
+    logfile = compiled / "log.xlsx"
+    count = collect_attachments.collect_and_log(
+        messages_dir / "attachments", compiled, logfile=logfile
+    )
+    assert count == 2
+    assert len(calls) == 2  # each file's EXIF is read once
+
+    ws = load_workbook(logfile).active
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows[0] == ("File Name", "Date", "Sender", "Recipient", "MD5", "Orientation")
+    by_name = {r[0]: r for r in rows[1:]}
+    assert set(by_name) == {
+        "Alice - 2024-01-01 00-00-00.jpg",
+        "Alice - 2024-01-01 00-00-00.mp4",
+    }
+    assert by_name["Alice - 2024-01-01 00-00-00.jpg"][5] == 1
+    assert by_name["Alice - 2024-01-01 00-00-00.mp4"][5] in ("", None)
@@ -1,6 +1,6 @@
-import importlib
-import sys
-from pathlib import Path
+import errno
+import hashlib
+import os
 from fractions import Fraction
 
 import pytest
@@ -10,16 +10,10 @@ pytest.importorskip("PIL")
 
 from openpyxl import load_workbook
 
-
-def load_module():
-    project_root = Path(__file__).resolve().parents[1]
-    sys.path.append(str(project_root))
-    return importlib.import_module("synchronoss_parser.collect_media")
+from synchronoss_parser import collect_media
 
 
 def test_write_excel_handles_rational(tmp_path):
-    collect_media = load_module()
-
     records = [{
         "File Name": "a.jpg",
         "Date": "2021-01-01",
@@ -36,8 +30,127 @@ def test_write_excel_handles_rational(tmp_path):
     logfile = tmp_path / "out.xlsx"
     collect_media.write_excel(records, exif_keys, logfile)
 
-    wb = load_workbook(logfile)
-    ws = wb.active
+    # Read-only mode parses just the rows asked for
+    wb = load_workbook(logfile, read_only=True)
+    (exposure, fnumber), = wb.active.iter_rows(min_row=2, min_col=5, values_only=True)
+    wb.close()
+
+    assert exposure == 0.5
+    assert fnumber == "2.5, 1.0"
+
+
+def test_fast_copy_preserves_data_and_mtime(tmp_path):
+    src = tmp_path / "clip.mp4"
+    src.write_bytes(b"\x00\x01" * 5000)
+    os.utime(src, (1_600_000_000, 1_600_000_000))
+    dest = tmp_path / "out" / "clip.mp4"
+    dest.parent.mkdir()
+
+    assert collect_media.fast_copy(src, dest) == dest
+    assert dest.read_bytes() == src.read_bytes()
+    assert dest.stat().st_mtime == src.stat().st_mtime
+
+
+def test_fast_copy_falls_back_when_copy_file_range_fails(tmp_path, monkeypatch):
+    def unsupported(*args, **kwargs):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+
+    src = tmp_path / "a.jpg"
+    src.write_bytes(b"\xFF\xD8\xFFdata")
+    dest = tmp_path / "b.jpg"
+
+    collect_media.fast_copy(src, dest)
+    assert dest.read_bytes() == src.read_bytes()
+
+
+def test_fast_copy_falls_back_on_short_copy_file_range(tmp_path, monkeypatch):
+    calls = []
+
+    def short(in_fd, out_fd, count):
+        # Copies a few bytes, then reports EOF
+        if calls:
+            return 0
+        calls.append(count)
+        return os.write(out_fd, os.read(in_fd, 4))
+
+    monkeypatch.setattr(os, "copy_file_range", short, raising=False)
+
+    src = tmp_path / "a.jpg"
+    src.write_bytes(b"\xFF\xD8\xFFdata" * 100)
+    dest = tmp_path / "b.jpg"
+
+    collect_media.fast_copy(src, dest)
+    assert calls
+    assert dest.read_bytes() == src.read_bytes()
+
+
+def test_collect_media_walks_nested_device_folders(tmp_path):
+    from PIL import Image
+
+    device = tmp_path / "VZMOBILE" / "2021-01-01" / "Phone"
+    nested = device / "DCIM" / "Camera"
+    nested.mkdir(parents=True)
+    Image.new("RGB", (4, 4), color="red").save(device / "a.jpg")
+    Image.new("RGB", (4, 4), color="blue").save(nested / "b.PNG")
+    (nested / "notes.txt").write_text("skip me")
+
+    compiled = tmp_path / "Compiled Media"
+    calls = []
+    records, _ = collect_media.collect_media(
+        tmp_path / "VZMOBILE", compiled, lambda done, total: calls.append((done, total))
+    )
+
+    assert sorted(r["File Name"] for r in records) == ["a.jpg", "b.PNG"]
+    assert {r["Device"] for r in records} == {"Phone"}
+    assert sorted(p.name for p in compiled.iterdir()) == ["a.jpg", "b.PNG"]
+    assert calls == [(2, 2)]
+
+
+@pytest.mark.parametrize("use_file_digest", [True, False])
+def test_md5sum_matches_hashlib(tmp_path, monkeypatch, use_file_digest):
+    if not use_file_digest:
+        monkeypatch.setattr(collect_media, "_file_digest", None)
+
+    path = tmp_path / "blob.bin"
+    data = os.urandom(3 * collect_media.HASH_CHUNK_SIZE + 17)
+    path.write_bytes(data)
+
+    assert collect_media.md5sum(path) == hashlib.md5(data).hexdigest()
+
+
+def test_copy_and_md5(tmp_path):
+    src = tmp_path / "clip.mov"
+    data = os.urandom(2 * collect_media.HASH_CHUNK_SIZE + 5)
+    src.write_bytes(data)
+    os.utime(src, (1_600_000_000, 1_600_000_000))
+    dest = tmp_path / "copy.mov"
+
+    assert collect_media.copy_and_md5(src, dest) == hashlib.md5(data).hexdigest()
+    assert dest.read_bytes() == data
+    assert dest.stat().st_mtime == src.stat().st_mtime
+
+
+def test_extract_exif_skips_non_image_extensions(tmp_path, monkeypatch):
+    def fail_open(*args, **kwargs):
+        raise AssertionError("video files should not be opened with PIL")
+
+    monkeypatch.setattr(collect_media.Image, "open", fail_open)
+    video = tmp_path / "clip.MP4"
+    video.write_bytes(b"\x00\x00\x00\x18ftypmp42")
+
+    assert collect_media.extract_exif(video) == {}
+
+
+def test_ensure_unique_name_with_taken_set(tmp_path):
+    (tmp_path / "a.jpg").write_bytes(b"")
+    (tmp_path / "a_1.jpg").write_bytes(b"")
+
+    taken = collect_media.existing_names(tmp_path)
+    first = collect_media.ensure_unique_name(tmp_path, "a.jpg", taken)
+    second = collect_media.ensure_unique_name(tmp_path, "a.jpg", taken)
 
-    assert ws.cell(row=2, column=5).value == 0.5
-    assert ws.cell(row=2, column=6).value == "2.5, 1.0"
+    assert first == tmp_path / "a_2.jpg"
+    assert second == tmp_path / "a_3.jpg"
+    assert collect_media.ensure_unique_name(tmp_path, "a.jpg") == first
@@ -1,17 +1,10 @@
-import importlib
-import sys
+import os
 import zipfile
-from pathlib import Path
 
-
-def load_module():
-    project_root = Path(__file__).resolve().parents[1]
-    sys.path.append(str(project_root))
-    return importlib.import_module("synchronoss_parser.collect_quarantined_files")
+from synchronoss_parser import collect_quarantined_files
 
 
 def test_collect_quarantined_files(tmp_path):
-    module = load_module()
     root = tmp_path / "VZMOBILE"
     root.mkdir()
     compiled = root / "Compiled Quarantine Files"
@@ -23,7 +16,7 @@ def test_collect_quarantined_files(tmp_path):
     zip_path = root / "sample.zip_file_1"
     zip_path.write_bytes(data)
 
-    copied, skipped, total = module.collect_quarantined_files(root, compiled)
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
 
     assert len(copied) == 1
     assert skipped == []
@@ -35,7 +28,6 @@ def test_collect_quarantined_files(tmp_path):
 
 
 def test_skips_invalid_archives(tmp_path):
-    module = load_module()
     root = tmp_path / "VZMOBILE"
     root.mkdir()
     compiled = root / "Compiled Quarantine Files"
@@ -49,7 +41,7 @@ def test_skips_invalid_archives(tmp_path):
     invalid_zip = root / "broken.zip_file_2"
     invalid_zip.write_text("not a zip")
 
-    copied, skipped, total = module.collect_quarantined_files(root, compiled)
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
 
     dest = compiled / "valid.jpg"
     assert dest.exists()
@@ -59,7 +51,6 @@ def test_skips_invalid_archives(tmp_path):
 
 
 def test_multiple_independent_files(tmp_path):
-    module = load_module()
     root = tmp_path / "VZMOBILE"
     root.mkdir()
     compiled = root / "Compiled Quarantine Files"
@@ -68,7 +59,7 @@ def test_multiple_independent_files(tmp_path):
     (root / "one.zip_file_1").write_bytes(b"\x89PNG\r\n\x1a\nrest")
     (root / "two.zip_file_1").write_bytes(b"\xFF\xD8\xFFrest")
 
-    copied, skipped, total = module.collect_quarantined_files(root, compiled)
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
 
     assert skipped == []
 
@@ -84,7 +75,6 @@ def test_multiple_independent_files(tmp_path):
 
 
 def test_skips_unallowed_extension(tmp_path):
-    module = load_module()
     root = tmp_path / "VZMOBILE"
     root.mkdir()
     compiled = root / "Compiled Quarantine Files"
@@ -94,10 +84,151 @@ def test_skips_unallowed_extension(tmp_path):
     with zipfile.ZipFile(zip_path, "w") as zf:
         zf.writestr("file", data)
 
-    copied, skipped, total = module.collect_quarantined_files(root, compiled)
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
 
     assert copied == []
     assert skipped == [zip_path]
     assert list(compiled.iterdir()) == []
     assert total == 1
 
+
+def test_reassembles_split_archives(tmp_path):
+    root = tmp_path / "VZMOBILE"
+    root.mkdir()
+    compiled = root / "Compiled Quarantine Files"
+
+    png = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+    for name in ("first", "second"):
+        archive = tmp_path / f"{name}.zip"
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(f"{name}_image", png)
+        data = archive.read_bytes()
+        half = len(data) // 2
+        (root / f"{name}.zip_file_1").write_bytes(data[:half])
+        (root / f"{name}.zip_file_2").write_bytes(data[half:])
+
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
+
+    assert skipped == []
+    assert total == 4
+    assert sorted(copied) == [compiled / "first_image.png", compiled / "second_image.png"]
+    assert all(p.read_bytes() == png for p in copied)
+
+
+def test_split_archives_in_a_bounded_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    root = tmp_path / "VZMOBILE"
+    root.mkdir()
+    compiled = root / "Compiled Quarantine Files"
+
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+    for name in ("a", "b", "c"):
+        archive = tmp_path / f"{name}.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr(f"{name}_image", png)
+        data = archive.read_bytes()
+        (root / f"{name}.zip_file_1").write_bytes(data[:10])
+        (root / f"{name}.zip_file_2").write_bytes(data[10:])
+    (root / "bad.zip_file_1").write_bytes(b"\x00" * 10)
+    (root / "bad.zip_file_2").write_bytes(b"\x00" * 10)
+
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
+
+    assert skipped == [root / "bad.zip_file_2"]
+    assert sorted(p.name for p in copied) == ["a_image.png", "b_image.png", "c_image.png"]
+    assert sorted(p.name for p in compiled.iterdir()) == ["a_image.png", "b_image.png", "c_image.png"]
+
+
+def test_extract_group_removes_combined_archive(tmp_path):
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+    archive = tmp_path / "src.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("image", png)
+    part = tmp_path / "src.zip_file_1"
+    part.write_bytes(archive.read_bytes())
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+
+    extracted = collect_quarantined_files._extract_group(tmp_path / "src", [(1, part)], workdir)
+
+    assert [(p.read_bytes(), name) for p, name in extracted] == [(png, "image.png")]
+    assert not list(workdir.glob("*_combined.zip"))
+
+
+def test_archive_members_filtered_and_renamed(tmp_path):
+    root = tmp_path / "VZMOBILE"
+    root.mkdir()
+    compiled = root / "Compiled Quarantine Files"
+
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+    archive = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a/photo.dat", png)
+        zf.writestr("b/photo.dat", png)
+        zf.writestr("notes.txt", b"not media")
+        zf.writestr("empty.txt", b"")
+        zf.writestr("empty.gif", b"")
+    data = archive.read_bytes()
+    (root / "bundle.zip_file_1").write_bytes(data[:10])
+    (root / "bundle.zip_file_2").write_bytes(data[10:])
+
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
+
+    assert skipped == []
+    assert copied == [compiled / "photo.png", compiled / "photo_1.png", compiled / "empty.gif"]
+    assert sorted(p.name for p in compiled.iterdir()) == ["empty.gif", "photo.png", "photo_1.png"]
+    assert [p.read_bytes() for p in copied] == [png, png, b""]
+
+
+def test_concat_parts_falls_back_to_copyfileobj(tmp_path, monkeypatch):
+    def unsupported(*args):
+        raise OSError("unsupported")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", unsupported, raising=False)
+
+    first = tmp_path / "a.z01"
+    first.write_bytes(b"PK\x07\x08first")
+    last = tmp_path / "a.zip"
+    last.write_bytes(b"-last")
+    out = tmp_path / "combined.zip"
+
+    collect_quarantined_files._concat_parts(out, [first, last], strip_marker=True)
+    assert out.read_bytes() == b"first-last"
+
+    collect_quarantined_files._concat_parts(out, [first, last], strip_marker=False)
+    assert out.read_bytes() == b"PK\x07\x08first-last"
+
+
+def test_safe_rglob_yields_nested_matching_files(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "dir.zip_file_1").mkdir()
+    (tmp_path / "top.zip_file_1").write_bytes(b"x")
+    (tmp_path / "a" / "b" / "deep.zip_file_2").write_bytes(b"x")
+    (tmp_path / "a" / "other.txt").write_bytes(b"x")
+    (tmp_path / "link.zip_file_1").symlink_to(tmp_path / "top.zip_file_1")
+
+    found = sorted(p.name for p in collect_quarantined_files.safe_rglob(tmp_path, "*.zip_file_*"))
+
+    assert found == ["deep.zip_file_2", "top.zip_file_1"]
+
+
+def test_concat_parts_resumes_after_partial_kernel_copy(tmp_path, monkeypatch):
+    real_copy_file_range = getattr(os, "copy_file_range", None)
+    calls = []
+
+    def fails_after_first_chunk(in_fd, out_fd, count, offset_src=None):
+        calls.append(offset_src)
+        if len(calls) > 1 or real_copy_file_range is None:
+            raise OSError("interrupted")
+        return real_copy_file_range(in_fd, out_fd, min(count, 3), offset_src)
+
+    monkeypatch.setattr(os, "copy_file_range", fails_after_first_chunk, raising=False)
+    monkeypatch.setattr(os, "sendfile", fails_after_first_chunk, raising=False)
+
+    part = tmp_path / "a.zip"
+    part.write_bytes(b"0123456789")
+    out = tmp_path / "combined.zip"
+
+    collect_quarantined_files._concat_parts(out, [part], strip_marker=False)
+    assert out.read_bytes() == b"0123456789"
@@ -0,0 +1,112 @@
+import math
+
+import pandas as pd
+import pytest
+
+from synchronoss_parser import contacts_to_excel
+
+
+def test_extract_phone_columns():
+    df = pd.DataFrame(
+        {
+            "tel": [
+                "number=555, type=cell, preference=1; number=556 , type=work",
+                None,
+                "type=home,number= ",
+                "number=a=b",
+            ]
+        }
+    )
+
+    df = contacts_to_excel.extract_phone_columns(df)
+
+    values = df[["phone_numbers", "phone_types", "phone_preferences"]]
+    assert values.fillna("").values.tolist() == [
+        ["555; 556", "cell; work", "1"],
+        ["", "", ""],
+        ["", "home", ""],
+        ["a=b", "", ""],
+    ]
+
+
+def test_extract_phone_columns_without_matches():
+    df = contacts_to_excel.extract_phone_columns(pd.DataFrame({"tel": [None, "nothing"]}))
+
+    assert df["phone_numbers"].isna().all()
+    assert df["phone_types"].isna().all()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_parse_contacts(monkeypatch, use_orjson):
+    if use_orjson and contacts_to_excel.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(contacts_to_excel, "orjson", None)
+
+    raw = '{"contacts": {"contact": [{"firstname": "Ann", "score": NaN},]'
+    contacts = contacts_to_excel.parse_contacts(raw)
+
+    assert contacts[0]["firstname"] == "Ann"
+    assert math.isnan(contacts[0]["score"])
+
+    with pytest.raises(ValueError, match="JSON parse error"):
+        contacts_to_excel.parse_contacts('{"contacts": {"contact": [oops]}}')
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_convert_contacts(tmp_path, monkeypatch, use_orjson):
+    if use_orjson and contacts_to_excel.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(contacts_to_excel, "orjson", None)
+    src = tmp_path / "contacts.txt"
+    src.write_bytes(
+        '{"contacts": {"contact": [\x01{"firstname": "Zoë", "lastname": "Ng",'
+        ' "tel": [{"number": "555", "type": "cell"}]}, {"firstname": "Al"},]'.encode("utf-8")
+        + b"\xff"
+    )
+    out = tmp_path / "contacts.xlsx"
+
+    assert contacts_to_excel.convert_contacts(str(src), str(out)) == 2
+
+    df = pd.read_excel(out)
+    assert df.columns[:5].tolist() == [
+        "firstname", "lastname", "phone_numbers", "phone_types", "phone_preferences"
+    ]
+    assert df["firstname"].tolist() == ["Zoë", "Al"]
+    assert df[["lastname", "phone_numbers"]].iloc[1].isna().all()
+    assert df.loc[0, "firstname"] == "Zoë"
+    assert df.loc[0, "phone_numbers"] == 555
+    assert df.loc[0, "phone_types"] == "cell"
+
+
+def test_convert_contacts_empty_file(tmp_path):
+    src = tmp_path / "contacts.txt"
+    src.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="JSON parse error"):
+        contacts_to_excel.convert_contacts(str(src), str(tmp_path / "contacts.xlsx"))
+
+
+@pytest.mark.parametrize("kind", [str, bytes])
+def test_quick_clean(kind):
+    raw = ' {"a": [1, 2,\n ],\x00 "b": {"c": 3,}} '
+    data = raw if kind is str else raw.encode()
+
+    cleaned = contacts_to_excel.quick_clean(data)
+
+    expected = '{"a": [1, 2], "b": {"c": 3}}'
+    assert cleaned == (expected if kind is str else expected.encode())
+
+
+def test_flatten_contacts_matches_json_normalize():
+    contacts = [
+        {"firstname": "Ann", "empty": {}, "name": {"parts": {"given": "Ann"}}, "tel": [{"number": "1"}]},
+        {"lastname": "Lee", "name": {"parts": {"family": "Lee"}}, "empty": {"k": 1}, "favorite": True},
+        {},
+    ]
+
+    expected = pd.json_normalize(contacts, sep=".")
+    actual = contacts_to_excel.flatten_contacts(contacts)
+
+    pd.testing.assert_frame_equal(actual, expected)
@@ -1,9 +1,5 @@
-import sys
-from pathlib import Path
-
 from PIL import Image
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
 from synchronoss_parser.attachment_log import create_thumbnail
 
 def test_create_thumbnail_non_image(tmp_path):
@@ -19,3 +15,11 @@ def test_create_thumbnail_image(tmp_path):
     dest = tmp_path / "thumb.png"
     assert create_thumbnail(src, dest) is True
     assert dest.exists()
+
+def test_create_thumbnail_large_jpeg(tmp_path):
+    src = tmp_path / "photo.jpg"
+    Image.new("RGB", (2000, 1000), color="blue").save(src)
+    dest = tmp_path / "thumbs" / "photo.jpg"
+    assert create_thumbnail(src, dest) is True
+    with Image.open(dest) as thumb:
+        assert thumb.size == (128, 64)
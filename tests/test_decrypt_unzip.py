@@ -1,42 +1,24 @@
 from __future__ import annotations
 
-import importlib
+import io
 import shutil
 import subprocess
-import sys
 import zipfile
 from pathlib import Path
 
 import pytest
 
-
-def load_module():
-    project_root = Path(__file__).resolve().parents[1]
-    sys.path.append(str(project_root))
-    return importlib.import_module("synchronoss_parser.decrypt_unzip")
+from synchronoss_parser import decrypt_unzip
 
 
 PASSWORD = "s3cr3t"
 
 
-def test_decrypt_and_unzip(tmp_path: Path) -> None:
-    """Decrypt nested archives and ensure all files are extracted."""
+def _gpg_encrypt(src: Path) -> bytes:
+    """Return ``src`` symmetrically encrypted with :data:`PASSWORD`."""
     if shutil.which("gpg") is None:
         pytest.skip("gpg not installed")
-
-    decrypt_unzip = load_module()
-
-    # Create a plain zipped file
-    plain_zip = tmp_path / "plain.zip"
-    with zipfile.ZipFile(plain_zip, "w") as zf:
-        zf.writestr("plain.txt", "hello")
-
-    # Create a zipped file and encrypt it with gpg
-    secret_zip = tmp_path / "secret.zip"
-    with zipfile.ZipFile(secret_zip, "w") as zf:
-        zf.writestr("secret.txt", "topsecret")
-
-    secret_gpg = tmp_path / "secret.zip.gpg"
+    out = src.with_name(src.name + ".gpg")
     subprocess.run(
         [
             "gpg",
@@ -46,17 +28,72 @@ def test_decrypt_and_unzip(tmp_path: Path) -> None:
             PASSWORD,
             "--symmetric",
             "-o",
-            str(secret_gpg),
-            str(secret_zip),
+            str(out),
+            str(src),
         ],
         check=True,
     )
+    return out.read_bytes()
+
+
+def _secret_zip() -> bytes:
+    """A zip archive holding ``secret.txt``."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("secret.txt", "topsecret")
+    return buf.getvalue()
+
+
+def _nested_archive(secret_zip_gpg: bytes) -> bytes:
+    """An archive holding ``plain.zip`` and the encrypted ``secret.zip.gpg``."""
+    plain = io.BytesIO()
+    with zipfile.ZipFile(plain, "w") as zf:
+        zf.writestr("plain.txt", "hello")
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("plain.zip", plain.getvalue())
+        zf.writestr("secret.zip.gpg", secret_zip_gpg)
+    return archive.getvalue()
+
+
+# gpg's key derivation dominates the one test that runs it, so the real
+# ciphertext is made once per session. The other tests check how archives
+# are walked and cleaned up, and use fake_gpg instead.
+
+
+@pytest.fixture(scope="session")
+def nested_archive(tmp_path_factory) -> bytes:
+    secret_zip = tmp_path_factory.mktemp("gpg") / "secret.zip"
+    secret_zip.write_bytes(_secret_zip())
+    return _nested_archive(_gpg_encrypt(secret_zip))
+
+
+FAKE_GPG_MAGIC = b"fake-gpg\n"
+
+
+@pytest.fixture
+def fake_gpg(monkeypatch):
+    """Replace gpg; a "ciphertext" is :data:`FAKE_GPG_MAGIC` plus the plaintext."""
+
+    def decrypt(src: Path, dest: Path, password: str) -> None:
+        data = src.read_bytes()
+        if password != PASSWORD or not data.startswith(FAKE_GPG_MAGIC):
+            raise RuntimeError(f"Failed to decrypt {src}: bad passphrase")
+        dest.write_bytes(data[len(FAKE_GPG_MAGIC):])
+
+    monkeypatch.setattr(decrypt_unzip, "_gpg_decrypt", decrypt)
+    monkeypatch.setattr(decrypt_unzip.shutil, "which", lambda cmd: cmd)
+
+
+@pytest.fixture
+def fake_nested_archive(fake_gpg) -> bytes:
+    return _nested_archive(FAKE_GPG_MAGIC + _secret_zip())
+
 
-    # Bundle both files into a parent archive
+def test_decrypt_and_unzip(tmp_path: Path, nested_archive: bytes) -> None:
+    """Decrypt nested archives and ensure all files are extracted."""
     archive_zip = tmp_path / "archive.zip"
-    with zipfile.ZipFile(archive_zip, "w") as zf:
-        zf.write(plain_zip, plain_zip.name)
-        zf.write(secret_gpg, secret_gpg.name)
+    archive_zip.write_bytes(nested_archive)
 
     # Decrypt and unzip the archive
     files = decrypt_unzip.decrypt_and_unzip(archive_zip, PASSWORD)
@@ -73,44 +110,10 @@ def test_decrypt_and_unzip(tmp_path: Path) -> None:
     assert archive_zip.exists()
 
 
-def test_decrypt_and_unzip_with_strings(tmp_path: Path) -> None:
+def test_decrypt_and_unzip_with_strings(tmp_path: Path, fake_nested_archive: bytes) -> None:
     """Accept string paths and a custom output directory."""
-    if shutil.which("gpg") is None:
-        pytest.skip("gpg not installed")
-
-    decrypt_unzip = load_module()
-
-    # Create a plain zipped file
-    plain_zip = tmp_path / "plain.zip"
-    with zipfile.ZipFile(plain_zip, "w") as zf:
-        zf.writestr("plain.txt", "hello")
-
-    # Create a zipped file and encrypt it with gpg
-    secret_zip = tmp_path / "secret.zip"
-    with zipfile.ZipFile(secret_zip, "w") as zf:
-        zf.writestr("secret.txt", "topsecret")
-
-    secret_gpg = tmp_path / "secret.zip.gpg"
-    subprocess.run(
-        [
-            "gpg",
-            "--batch",
-            "--yes",
-            "--passphrase",
-            PASSWORD,
-            "--symmetric",
-            "-o",
-            str(secret_gpg),
-            str(secret_zip),
-        ],
-        check=True,
-    )
-
-    # Bundle both files into a parent archive
     archive_zip = tmp_path / "archive.zip"
-    with zipfile.ZipFile(archive_zip, "w") as zf:
-        zf.write(plain_zip, plain_zip.name)
-        zf.write(secret_gpg, secret_gpg.name)
+    archive_zip.write_bytes(fake_nested_archive)
 
     output_dir = tmp_path / "custom_output"
 
@@ -128,44 +131,10 @@ def test_decrypt_and_unzip_with_strings(tmp_path: Path) -> None:
     assert archive_zip.exists()
 
 
-def test_decrypt_and_unzip_no_cleanup(tmp_path: Path) -> None:
+def test_decrypt_and_unzip_no_cleanup(tmp_path: Path, fake_nested_archive: bytes) -> None:
     """Keep original archives when cleanup is disabled."""
-    if shutil.which("gpg") is None:
-        pytest.skip("gpg not installed")
-
-    decrypt_unzip = load_module()
-
-    # Create a plain zipped file
-    plain_zip = tmp_path / "plain.zip"
-    with zipfile.ZipFile(plain_zip, "w") as zf:
-        zf.writestr("plain.txt", "hello")
-
-    # Create a zipped file and encrypt it with gpg
-    secret_zip = tmp_path / "secret.zip"
-    with zipfile.ZipFile(secret_zip, "w") as zf:
-        zf.writestr("secret.txt", "topsecret")
-
-    secret_gpg = tmp_path / "secret.zip.gpg"
-    subprocess.run(
-        [
-            "gpg",
-            "--batch",
-            "--yes",
-            "--passphrase",
-            PASSWORD,
-            "--symmetric",
-            "-o",
-            str(secret_gpg),
-            str(secret_zip),
-        ],
-        check=True,
-    )
-
-    # Bundle both files into a parent archive
     archive_zip = tmp_path / "archive.zip"
-    with zipfile.ZipFile(archive_zip, "w") as zf:
-        zf.write(plain_zip, plain_zip.name)
-        zf.write(secret_gpg, secret_gpg.name)
+    archive_zip.write_bytes(fake_nested_archive)
 
     # Decrypt and unzip the archive without cleaning up
     files = decrypt_unzip.decrypt_and_unzip(archive_zip, PASSWORD, cleanup=False)
@@ -182,35 +151,11 @@ def test_decrypt_and_unzip_no_cleanup(tmp_path: Path) -> None:
     assert archive_zip.exists()
 
 
-def test_decrypt_and_unzip_plain_gpg(tmp_path: Path) -> None:
+def test_decrypt_and_unzip_plain_gpg(tmp_path: Path, fake_gpg) -> None:
     """Decrypt standalone ``.gpg`` files inside the archive."""
-    if shutil.which("gpg") is None:
-        pytest.skip("gpg not installed")
-
-    decrypt_unzip = load_module()
-
-    secret_txt = tmp_path / "secret.txt"
-    secret_txt.write_text("topsecret")
-
-    secret_gpg = tmp_path / "secret.txt.gpg"
-    subprocess.run(
-        [
-            "gpg",
-            "--batch",
-            "--yes",
-            "--passphrase",
-            PASSWORD,
-            "--symmetric",
-            "-o",
-            str(secret_gpg),
-            str(secret_txt),
-        ],
-        check=True,
-    )
-
     archive_zip = tmp_path / "archive.zip"
     with zipfile.ZipFile(archive_zip, "w") as zf:
-        zf.write(secret_gpg, secret_gpg.name)
+        zf.writestr("secret.txt.gpg", FAKE_GPG_MAGIC + b"topsecret")
 
     files = decrypt_unzip.decrypt_and_unzip(archive_zip, PASSWORD)
 
@@ -221,3 +166,43 @@ def test_decrypt_and_unzip_plain_gpg(tmp_path: Path) -> None:
     assert extracted_secret.read_text() == "topsecret"
     assert not list(archive.glob("**/*.gpg"))
     assert archive_zip.exists()
+
+
+def test_decrypt_and_unzip_many_nested_zips(tmp_path: Path) -> None:
+    """Expand sibling archives and archives nested several levels deep."""
+    archive_zip = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive_zip, "w") as outer:
+        for i in range(4):
+            inner = tmp_path / f"inner{i}.zip"
+            with zipfile.ZipFile(inner, "w") as zf:
+                zf.writestr(f"file{i}.txt", str(i))
+            deep = tmp_path / f"deep{i}.zip"
+            with zipfile.ZipFile(deep, "w") as zf:
+                zf.write(inner, inner.name)
+            outer.write(deep, f"folder{i}/{deep.name}")
+
+    files = decrypt_unzip.decrypt_and_unzip(archive_zip, PASSWORD)
+
+    archive = tmp_path / "archive"
+    assert files == [
+        archive / f"folder{i}" / f"deep{i}" / f"inner{i}" / f"file{i}.txt" for i in range(4)
+    ]
+    assert not list(archive.glob("**/*.zip"))
+
+
+def test_decrypt_passphrase_not_in_argv(tmp_path: Path, monkeypatch) -> None:
+    """The passphrase is sent to gpg on stdin, never on the command line."""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append((cmd, kwargs))
+        return subprocess.CompletedProcess(cmd, 2, "", "bad passphrase")
+
+    monkeypatch.setattr(decrypt_unzip.subprocess, "run", fake_run)
+
+    with pytest.raises(RuntimeError, match="bad passphrase"):
+        decrypt_unzip._gpg_decrypt(tmp_path / "secret.txt.gpg", tmp_path / "secret.txt", PASSWORD)
+
+    (cmd, kwargs), = calls
+    assert PASSWORD not in cmd
+    assert kwargs["input"] == PASSWORD
@@ -1,33 +1,21 @@
-import importlib
-import sys
-from pathlib import Path
+import pytest
 
+from synchronoss_parser import collect_quarantined_files
 
-def load_module():
-    project_root = Path(__file__).resolve().parents[1]
-    sys.path.append(str(project_root))
-    return importlib.import_module("synchronoss_parser.collect_quarantined_files")
 
-
-def test_detect_mp3(tmp_path):
-    module = load_module()
-    data = b"ID3" + b"\x00" * 13
-    path = tmp_path / "audio"
-    path.write_bytes(data)
-    assert module.detect_extension(path) == ".mp3"
+@pytest.mark.parametrize(
+    "data, ext",
+    [
+        (b"ID3" + b"\x00" * 13, ".mp3"),
+        (b"RIFF" + b"\x00" * 4 + b"WAVE" + b"\x00" * 4, ".wav"),
+        (b"\x00\x00\x00\x14ftypqt  " + b"\x00" * 4, ".mov"),
+    ],
+)
+def test_extension_from_header(data, ext):
+    assert collect_quarantined_files._extension_from_header(data) == ext
 
 
-def test_detect_wav(tmp_path):
-    module = load_module()
-    data = b"RIFF" + b"\x00" * 4 + b"WAVE" + b"\x00" * 4
+def test_detect_extension_reads_file_header(tmp_path):
     path = tmp_path / "audio"
-    path.write_bytes(data)
-    assert module.detect_extension(path) == ".wav"
-
-
-def test_detect_mov(tmp_path):
-    module = load_module()
-    data = b"\x00\x00\x00\x14ftypqt  " + b"\x00" * 4
-    path = tmp_path / "video"
-    path.write_bytes(data)
-    assert module.detect_extension(path) == ".mov"
+    path.write_bytes(b"ID3" + b"\x00" * 13)
+    assert collect_quarantined_files.detect_extension(path) == ".mp3"
@@ -1,9 +1,5 @@
-import sys
-from pathlib import Path
-
 import pytest
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
 from synchronoss_parser.render_transcripts import Message, group_messages_by_chat
 
 
@@ -48,3 +44,10 @@ def test_group_chat_grouping():
     grouped_msgs = groups[key]
     assert grouped_msgs[0].sender == "222"
     assert grouped_msgs[1].recipients == "444"
+
+
+def test_grouping_uses_loader_split_recipients():
+    msg = make_message("in", sender="333", recipients="Smith, Ann; 444")
+    msg.recipient_list = ["Smith, Ann", "444"]
+    groups = group_messages_by_chat([msg], target="222")
+    assert list(groups) == [("222", "333", "444", "Smith, Ann")]
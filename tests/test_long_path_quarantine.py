@@ -1,25 +1,19 @@
-import importlib
-import sys
-from pathlib import Path
-import os
+import zipfile
 
-
-def load_module():
-    project_root = Path(__file__).resolve().parents[1]
-    sys.path.append(str(project_root))
-    return importlib.import_module("synchronoss_parser.collect_quarantined_files")
+from synchronoss_parser import collect_quarantined_files
 
 
 def test_long_paths(tmp_path, monkeypatch):
-    module = load_module()
+    limit = 200
     root = tmp_path / "VZMOBILE"
     root.mkdir()
 
     compiled = root / ("Compiled Quarantine Files" + "x" * 100)
 
+    # Nest only as deep as needed for the source path to pass the limit
     deep = root
-    for i in range(10):
-        deep = deep / ("dir" + str(i) + "a" * 20)
+    while len(str(deep / "sample.zip_file_1")) <= limit:
+        deep = deep / ("dir" + str(len(deep.parts)) + "a" * 20)
     deep.mkdir(parents=True)
 
     # Store raw JPEG bytes directly; the function should handle the long path
@@ -29,11 +23,39 @@ def test_long_paths(tmp_path, monkeypatch):
     zip_path.write_bytes(data)
 
     # enforce a small path limit to trigger shortening logic
-    monkeypatch.setattr(os, "pathconf", lambda *args, **kwargs: 200)
+    monkeypatch.setattr(collect_quarantined_files, "_path_limit", lambda anchor: limit)
 
-    copied, skipped, total = module.collect_quarantined_files(root, compiled)
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
     assert skipped == []
     assert len(copied) == 1
     assert copied[0].exists()
-    assert len(str(copied[0])) <= 200
+    assert len(str(copied[0])) <= limit
     assert total == 1
+
+
+def test_long_member_names(tmp_path, monkeypatch):
+    limit = 200
+    root = tmp_path / "VZMOBILE"
+    root.mkdir()
+    compiled = root / ("Compiled Quarantine Files" + "x" * 100)
+
+    # A member name longer than the file system allows, twice over so the
+    # shortened names collide
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+    archive = tmp_path / "src.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a/" + "p" * 300 + ".png", png)
+        zf.writestr("b/" + "p" * 300 + ".png", png)
+    (root / "sample.zip_file_1").write_bytes(archive.read_bytes())
+
+    monkeypatch.setattr(collect_quarantined_files, "_path_limit", lambda anchor: limit)
+
+    copied, skipped, total = collect_quarantined_files.collect_quarantined_files(root, compiled)
+    assert skipped == []
+    assert len(copied) == 2
+    assert len(set(copied)) == 2
+    for path in copied:
+        assert path.parent == compiled
+        assert path.suffix == ".png"
+        assert len(str(path)) <= limit
+        assert path.read_bytes() == png
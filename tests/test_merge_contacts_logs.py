@@ -0,0 +1,43 @@
+import pandas as pd
+
+from synchronoss_parser import merge_contacts_logs
+
+
+def test_merge_call_log(tmp_path):
+    contacts = tmp_path / "contacts.xlsx"
+    pd.DataFrame(
+        [
+            {"firstname": "Alice", "lastname": "Smith", "phone_numbers": "(123) 456-7890"},
+            {"firstname": "Bob", "lastname": "Jones", "phone_numbers": "555-000-1111; +1 555 000 2222"},
+        ]
+    ).to_excel(contacts, index=False)
+
+    call_log = tmp_path / "call_log.csv"
+    call_log.write_text(
+        "caller,recipient\n"
+        "+1 (123) 456-7890,5550002222\n"
+        "9998887777,\n"
+        "15550001111,123-456-7890\n"
+    )
+    out = tmp_path / "named.csv"
+
+    assert merge_contacts_logs.merge_call_log(str(call_log), str(contacts), str(out)) == 3
+
+    df = pd.read_csv(out, dtype=str, keep_default_na=False)
+    assert df["caller_name"].tolist() == ["Alice Smith", "9998887777", "Bob Jones"]
+    assert df["recipient_name"].tolist() == ["Bob Jones", "", "Alice Smith"]
+
+
+def test_name_column_matches_lookup(tmp_path):
+    from synchronoss_parser.render_transcripts import build_contact_lookup
+
+    contacts = tmp_path / "contacts.xlsx"
+    pd.DataFrame(
+        [{"firstname": "Alice", "lastname": "Smith", "phone_numbers": "123-456-7890"}]
+    ).to_excel(contacts, index=False)
+    numbers = pd.Series(["1234567890", "+1 123 456 7890", "555", None, 11234567890])
+
+    expected = numbers.apply(build_contact_lookup(str(contacts)))
+    actual = merge_contacts_logs.name_column(numbers, merge_contacts_logs.build_contact_map(str(contacts)))
+
+    assert actual.fillna("").tolist() == expected.fillna("").tolist()
@@ -1,9 +1,5 @@
-import sys
-from pathlib import Path
-
 import pytest
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
 from synchronoss_parser.utils import normalize_phone_number
 
 
@@ -18,3 +14,11 @@ from synchronoss_parser.utils import normalize_phone_number
 )
 def test_normalize_phone_number(raw, expected):
     assert normalize_phone_number(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [("", ""), (None, ""), (5551234, "5551234"), ("٥٥٥-1234 ext.", "٥٥٥1234"), ("tel:555²", "555²")],
+)
+def test_normalize_phone_number_edge_cases(raw, expected):
+    assert normalize_phone_number(raw) == expected
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from synchronoss_parser.render_transcripts import parse_csv_date
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("2024-01-20T10:11:12Z", datetime(2024, 1, 20, 10, 11, 12, tzinfo=timezone.utc)),
+        ("2024-01-20 10:11:12", datetime(2024, 1, 20, 10, 11, 12)),
+        (
+            "2024-01-20T10:11:12.5-05:00",
+            datetime(2024, 1, 20, 10, 11, 12, 500000, tzinfo=timezone(timedelta(hours=-5))),
+        ),
+        ("01/20/2024 10:11:12", datetime(2024, 1, 20, 10, 11, 12)),
+        ("1/20/2024 10:11:12 PM", datetime(2024, 1, 20, 22, 11, 12)),
+        ("  01/20/2024 10:11:12  ", datetime(2024, 1, 20, 10, 11, 12)),
+        ("1705745472", datetime(2024, 1, 20, 10, 11, 12, tzinfo=timezone.utc)),
+        ("1705745472000", datetime(2024, 1, 20, 10, 11, 12, tzinfo=timezone.utc)),
+        ("", None),
+        ("not a date", None),
+    ],
+)
+def test_parse_csv_date_formats(raw, expected):
+    assert parse_csv_date(raw) == expected
+    # Cached and uncached results agree
+    parse_csv_date.cache_clear()
+    assert parse_csv_date(raw) == expected
+
+
+def test_parse_csv_date_alternating_formats():
+    values = ["01/20/2024 10:11:12", "1/20/2024 10:11:12 PM"] * 2
+    assert [parse_csv_date.__wrapped__(v).hour for v in values] == [10, 22, 10, 22]
@@ -0,0 +1,103 @@
+import sys
+
+import pytest
+
+from synchronoss_parser import render_transcripts
+from synchronoss_parser.render_transcripts import read_csv_columns
+
+
+@pytest.fixture(params=["pyarrow", "csv"])
+def reader(request, monkeypatch):
+    if request.param == "pyarrow":
+        if render_transcripts.pa_csv is None:
+            pytest.skip("pyarrow not installed")
+    else:
+        monkeypatch.setattr(render_transcripts, "pa_csv", None)
+    return request.param
+
+
+def test_read_csv_columns_selects_by_header_name(tmp_path, reader):
+    csv_file = tmp_path / "20240101.csv"
+    csv_file.write_text(
+        "Date,Type,Body,\"Message ID\"\n"
+        "2024-01-01,sms,\"Hello,\nworld\",id1\n"
+        "\n"
+        "2024-01-02,mms,,0002\n"
+    )
+
+    rows = list(read_csv_columns(csv_file, ("Message ID", "Body", "Sender", "Date")))
+
+    assert rows == [
+        ("id1", "Hello,\nworld", "", "2024-01-01"),
+        ("0002", "", "", "2024-01-02"),
+    ]
+
+
+def test_read_csv_columns_pads_short_rows(tmp_path, reader):
+    csv_file = tmp_path / "20240101.csv"
+    csv_file.write_text("Date,Type,Body\n2024-01-01,sms,Hi\n2024-01-02,mms\n")
+
+    rows = list(read_csv_columns(csv_file, ("Body", "Date")))
+
+    assert rows == [("Hi", "2024-01-01"), ("", "2024-01-02")]
+
+
+def test_read_csv_columns_single_column_and_empty_file(tmp_path, reader):
+    csv_file = tmp_path / "one.csv"
+    csv_file.write_text("Type\nsms\n")
+    assert list(read_csv_columns(csv_file, ("Type",))) == [("sms",)]
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+    assert list(read_csv_columns(empty, ("Type",))) == []
+
+
+def test_read_csv_columns_skips_bom(tmp_path, reader):
+    csv_file = tmp_path / "20240101.csv"
+    csv_file.write_bytes(b"\xef\xbb\xbfDate,Body\n2024-01-01,Hi\n")
+
+    assert list(read_csv_columns(csv_file, ("Date", "Body"))) == [("2024-01-01", "Hi")]
+
+
+def test_read_csv_columns_duplicate_header_uses_first(tmp_path, reader):
+    csv_file = tmp_path / "20240101.csv"
+    csv_file.write_text("Body,Date,Body\nfirst,2024-01-01,second\n")
+
+    assert list(read_csv_columns(csv_file, ("Body", "Date"))) == [("first", "2024-01-01")]
+
+
+def test_load_messages_from_csv(tmp_path, reader):
+    csv_file = tmp_path / "20240120.csv"
+    csv_file.write_text(
+        "Date,Type,Direction,Attachments,Body,Sender,Recipients\n"
+        "01/20/2024 10:11:12, SMS ,IN,\"a.jpg; b.png\",\"hi\nthere\",+1 555,\"111, 222\"\n"
+        "\n"
+        "2024-01-20T09:00:00,mms,out\n"
+    )
+
+    msgs = render_transcripts.load_messages_from_csv(csv_file, lambda n: f"<{n}>")
+
+    assert [(m.date_raw, m.msg_type, m.direction) for m in msgs] == [
+        ("2024-01-20T09:00:00", "mms", "out"),
+        ("01/20/2024 10:11:12", "sms", "in"),
+    ]
+    first, second = msgs
+    assert (first.attachments, first.body, first.sender, first.recipients) == ([], "", "<>", "")
+    assert second.attachments == ["a.jpg", "b.png"]
+    assert second.body == "hi\nthere"
+    assert (second.sender, second.recipients) == ("<+1 555>", "<111>; <222>")
+    assert second.message_id == ""
+    assert {m.attachment_day for m in msgs} == {"2024-01-20"}
+
+
+def test_loaded_messages_share_repeated_strings(tmp_path):
+    csv_file = tmp_path / "20240120.csv"
+    csv_file.write_text("Type,Direction,Sender\nsms,in,111\nSMS,IN,111\n")
+
+    first, second = render_transcripts.load_messages_from_csv(csv_file)
+
+    assert first.msg_type is second.msg_type
+    assert first.direction is second.direction
+    assert first.sender is second.sender
+    if sys.version_info >= (3, 10):
+        assert not hasattr(first, "__dict__")
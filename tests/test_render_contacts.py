@@ -1,14 +1,12 @@
-import sys
-from pathlib import Path
-
 import pandas as pd
 import pytest
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
 from synchronoss_parser.render_transcripts import (
     Message,
     build_contact_lookup,
+    build_contact_map,
     normalize_phone_number,
+    normalize_phone_series,
     render_thread_html,
 )
 
@@ -57,6 +55,15 @@ def test_normalize_phone_number_variants(raw, expected):
     assert normalize_phone_number(raw) == expected
 
 
+def test_normalize_phone_series_matches_scalar():
+    raw = ["+12223334444", "(111) 222-3333", "\u0663\u0663\u0663-1234", "\u2460555", "", "+1 111-222-3333"]
+
+    series = normalize_phone_series(pd.Series(raw, index=range(10, 16)))
+
+    assert list(series.index) == list(range(10, 16))
+    assert series.tolist() == [normalize_phone_number(n) for n in raw]
+
+
 def test_contact_lookup_handles_various_phone_formats(tmp_path):
     df = pd.DataFrame(
         [
@@ -72,3 +79,54 @@ def test_contact_lookup_handles_various_phone_formats(tmp_path):
     assert lookup("+12223334444") == "Bob Jones"
     for variant in ["111-222-3333", "(111) 222-3333", "+1 111-222-3333", "1112223333"]:
         assert lookup(variant) == "Alice Smith"
+
+
+def test_contact_map_multiple_numbers_and_blank_fields(tmp_path):
+    df = pd.DataFrame(
+        [
+            {"firstname": "Carol", "lastname": None, "phone_numbers": "555-000-1111; 555-000-2222"},
+            {"firstname": None, "lastname": None, "phone_numbers": "555-000-3333"},
+            {"firstname": "Dan", "lastname": "Lee", "phone_numbers": None},
+            {"firstname": "Eve", "lastname": "", "phone_numbers": "5550002222"},
+        ]
+    )
+    xlsx_path = tmp_path / "contacts.xlsx"
+    df.to_excel(xlsx_path, index=False)
+
+    assert build_contact_map(str(xlsx_path)) == {
+        "5550001111": "Carol",
+        "5550002222": "Eve",
+    }
+    assert build_contact_map(None) == {}
+
+
+def test_render_resolves_each_sender_once(tmp_path):
+    calls = []
+
+    def lookup(number):
+        calls.append(number)
+        return f"Name {number}"
+
+    msgs = [
+        Message(
+            date_raw="",
+            date_dt=None,
+            msg_type="sms",
+            direction="in",
+            attachments=[],
+            body="Hello",
+            sender=sender,
+            recipients="",
+            message_id=str(i),
+            attachment_day=None,
+        )
+        for i, sender in enumerate(["111", "222", "111", "111"])
+    ]
+
+    out_file = tmp_path / "out.html"
+    render_thread_html(tmp_path, out_file, msgs, ["111", "222"], "111", lookup)
+
+    html = out_file.read_text()
+    assert html.count('<div class="sender">Name 111</div>') == 3
+    assert calls.count("111") == 3  # participants, target and senders
+    assert calls.count("222") == 2
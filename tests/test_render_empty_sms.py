@@ -1,7 +1,3 @@
-import sys
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).resolve().parents[1]))
 from synchronoss_parser.render_transcripts import Message, render_thread_html
 
 
@@ -0,0 +1,29 @@
+from synchronoss_parser import render_transcripts
+from synchronoss_parser.render_transcripts import Message, render_thread_html
+
+
+def test_flushing_in_blocks_matches_single_write(tmp_path, monkeypatch):
+    msgs = [
+        Message(
+            date_raw=f"2024-01-{i % 3 + 1:02d}T10:00:00",
+            date_dt=None,
+            msg_type="sms",
+            direction="in" if i % 2 else "out",
+            attachments=[],
+            body=f"message {i} <b>",
+            sender="123",
+            recipients="",
+            message_id=f"id{i}",
+            attachment_day=None,
+        )
+        for i in range(50)
+    ]
+
+    whole = tmp_path / "whole.html"
+    render_thread_html(tmp_path, whole, msgs, ["123"], "123")
+
+    monkeypatch.setattr(render_transcripts, "FLUSH_PARTS", 7)
+    blocks = tmp_path / "blocks.html"
+    assert render_thread_html(tmp_path, blocks, msgs, ["123"], "123") == (50, 0)
+
+    assert blocks.read_bytes() == whole.read_bytes()
@@ -0,0 +1,58 @@
+import sys
+
+from openpyxl import load_workbook
+
+from synchronoss_parser import render_transcripts
+
+
+def test_main_renders_threads_and_call_log(tmp_path, monkeypatch):
+    messages = tmp_path / "messages"
+    messages.mkdir()
+    header = "Date,Type,Direction,Attachments,Body,Sender,Recipients,Message ID\n"
+    (messages / "20240101.csv").write_text(
+        header
+        + "2024-01-01T10:00:00,sms,in,,hello,222,111,m1\n"
+        + "2024-01-01T11:00:00,call,out,,,111,222,c1\n"
+    )
+    (messages / "20240102.csv").write_text(
+        header
+        + "2024-01-02T09:00:00,sms,out,,reply,111,222,m2\n"
+        + "2024-01-02T09:30:00,sms,in,,other,333,111,m3\n"
+    )
+    out = tmp_path / "out"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["render_transcripts", "--in", str(messages), "--out", str(out), "--target-number", "111"],
+    )
+
+    render_transcripts.main()
+
+    chat = (out / "chat-111-222.html").read_text(encoding="utf-8")
+    assert chat.index("hello") < chat.index("reply")
+    assert "other" in (out / "chat-111-333.html").read_text(encoding="utf-8")
+    assert "chat-111-222.html" in (out / "index.html").read_text(encoding="utf-8")
+
+    book = load_workbook(out / "Call Log.xlsx")
+    assert book.sheetnames == ["Sheet"]
+    rows = list(book.active.values)
+    assert rows[0] == ("Date", "Direction", "Sender", "Recipients", "Message ID")
+    assert [row[1:] for row in rows[1:]] == [("out", "111", "222", "c1")]
+
+
+def test_main_gzip_writes_compressed_chats(tmp_path):
+    import gzip
+
+    messages = tmp_path / "messages"
+    messages.mkdir()
+    (messages / "20240101.csv").write_text(
+        "Date,Type,Direction,Body,Sender,Recipients\n2024-01-01T10:00:00,sms,in,hello,222,111\n"
+    )
+    out = tmp_path / "out"
+    render_transcripts.main(
+        ["--in", str(messages), "--out", str(out), "--target-number", "111", "--gzip"]
+    )
+
+    with gzip.open(out / "chat-111-222.html.gz", "rt", encoding="utf-8") as f:
+        assert "hello" in f.read()
+    assert 'href="chat-111-222.html.gz"' in (out / "index.html").read_text(encoding="utf-8")
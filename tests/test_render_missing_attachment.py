@@ -1,7 +1,3 @@
-import sys
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).resolve().parents[1]))
 from synchronoss_parser.render_transcripts import Message, render_thread_html
 
 
@@ -28,3 +24,164 @@ def test_mms_without_attachment_renders_placeholder(tmp_path):
     html = out_file.read_text()
     assert "<div class=\"body-text missing\">NO MMS ATTACHMENT AVAILABLE - LOG ONLY</div>" in html
 
+
+
+def test_attachments_found_in_dated_and_fallback_folders(tmp_path):
+    base = tmp_path / "attachments" / "mms" / "in"
+    (base / "2024-01-20").mkdir(parents=True)
+    (base / "2024-01-20" / "a.jpg").write_bytes(b"x")
+    (base / "b.png").write_bytes(b"x")
+    msg = Message(
+        date_raw="",
+        date_dt=None,
+        msg_type="mms",
+        direction="in",
+        attachments=["a.jpg", "b.png", "c.gif"],
+        body="",
+        sender="123",
+        recipients="",
+        message_id="id1",
+        attachment_day="2024-01-20",
+    )
+
+    out_file = tmp_path / "out.html"
+    total, with_attach = render_thread_html(tmp_path, out_file, [msg], ["123"], "123")
+
+    assert (total, with_attach) == (1, 1)
+    html = out_file.read_text()
+    assert 'src="attachments/mms/in/2024-01-20/a.jpg"' in html
+    assert 'src="attachments/mms/in/b.png"' in html
+    assert "(missing attachment: c.gif)" in html
+
+
+def test_attachment_names_match_across_unicode_forms(tmp_path):
+    import unicodedata
+
+    day_dir = tmp_path / "attachments" / "mms" / "in" / "2024-01-20"
+    day_dir.mkdir(parents=True)
+    # Stored decomposed (as macOS does), referenced composed in the CSV
+    on_disk = unicodedata.normalize("NFD", "caf\u00e9.jpg")
+    (day_dir / on_disk).write_bytes(b"x")
+    msg = Message(
+        date_raw="",
+        date_dt=None,
+        msg_type="mms",
+        direction="in",
+        attachments=["caf\u00e9.jpg"],
+        body="",
+        sender="123",
+        recipients="",
+        message_id="id1",
+        attachment_day="2024-01-20",
+    )
+
+    out_file = tmp_path / "out.html"
+    assert render_thread_html(tmp_path, out_file, [msg], ["123"], "123") == (1, 1)
+
+    html = out_file.read_text(encoding="utf-8")
+    assert "missing attachment" not in html
+    assert f'src="attachments/mms/in/2024-01-20/{on_disk}"' in html
+
+
+def test_attachment_names_with_subfolder(tmp_path):
+    day_dir = tmp_path / "attachments" / "mms" / "in" / "2024-01-20"
+    (day_dir / "sub").mkdir(parents=True)
+    (day_dir / "sub" / "a.jpg").write_bytes(b"x")
+    msg = Message(
+        date_raw="",
+        date_dt=None,
+        msg_type="mms",
+        direction="in",
+        attachments=["sub/a.jpg", "sub/b.jpg"],
+        body="",
+        sender="123",
+        recipients="",
+        message_id="id1",
+        attachment_day="2024-01-20",
+    )
+
+    out_file = tmp_path / "out.html"
+    assert render_thread_html(tmp_path, out_file, [msg], ["123"], "123") == (1, 1)
+
+    html = out_file.read_text()
+    assert 'src="attachments/mms/in/2024-01-20/sub/a.jpg"' in html
+    assert "(missing attachment: sub/b.jpg)" in html
+
+
+def test_prefetch_lists_each_attachment_folder_once(tmp_path, monkeypatch):
+    from synchronoss_parser import render_transcripts
+
+    day_dir = tmp_path / "attachments" / "mms" / "in" / "2024-01-20"
+    day_dir.mkdir(parents=True)
+    (day_dir / "a.jpg").write_bytes(b"x")
+    msgs = [
+        Message(
+            date_raw="",
+            date_dt=None,
+            msg_type="mms",
+            direction="in",
+            attachments=attachments,
+            body="",
+            sender="123",
+            recipients="",
+            message_id=str(i),
+            attachment_day=day,
+        )
+        for i, (attachments, day) in enumerate(
+            [(["a.jpg"], "2024-01-20"), (["b.jpg"], "2024-01-20"), ([], "2024-01-21"), (["c.jpg"], None)]
+        )
+    ]
+
+    listed = []
+    list_dir = render_transcripts._list_dir
+    monkeypatch.setattr(render_transcripts, "_list_dir", lambda d: listed.append(d) or list_dir(d))
+
+    dir_index = render_transcripts.prefetch_attachment_dirs(tmp_path, msgs)
+    assert sorted(dir_index) == sorted([str(day_dir), str(day_dir.parent)])
+    assert dir_index[str(day_dir)] == {"a.jpg": "a.jpg"}
+    render_thread_html(tmp_path, tmp_path / "out.html", msgs, ["123"], "123", dir_index=dir_index)
+    assert len(listed) == 2
+
+    # Without a prefetched index each render lists the folders afresh
+    (day_dir / "b.jpg").write_bytes(b"x")
+    render_thread_html(tmp_path, tmp_path / "out.html", msgs, ["123"], "123")
+    assert len(listed) == 3
+    assert "(missing attachment: b.jpg)" not in (tmp_path / "out.html").read_text()
+
+
+def test_repeated_attachment_snippet_built_once(tmp_path, monkeypatch):
+    from synchronoss_parser import render_transcripts
+
+    day_dir = tmp_path / "attachments" / "mms" / "in" / "2024-01-20"
+    day_dir.mkdir(parents=True)
+    (day_dir / "a.jpg").write_bytes(b"x")
+    (day_dir / "card.vcf").write_text("hi")
+    calls = []
+    real_relpath = render_transcripts.relpath_for_html
+    monkeypatch.setattr(
+        render_transcripts, "relpath_for_html", lambda out, target: calls.append(target.name) or real_relpath(out, target)
+    )
+    msgs = [
+        Message(
+            date_raw="",
+            date_dt=None,
+            msg_type="mms",
+            direction="in",
+            attachments=["a.jpg", "card.vcf"],
+            body="",
+            sender="123",
+            recipients="",
+            message_id=str(i),
+            attachment_day="2024-01-20",
+        )
+        for i in range(3)
+    ]
+
+    out_file = tmp_path / "out.html"
+    assert render_thread_html(tmp_path, out_file, msgs, ["123"], "123") == (3, 3)
+
+    html = out_file.read_text()
+    assert html.count('src="attachments/mms/in/2024-01-20/a.jpg"') == 3
+    assert html.count('<pre class="code" style="white-space:pre-wrap">hi</pre>') == 3
+    assert calls.count("a.jpg") == 1
+    assert calls.count("card.vcf") == 3
@@ -0,0 +1,39 @@
+import json
+
+from synchronoss_parser.render_transcripts import Message, render_thread_html, search_text
+
+
+def make_message(body, sender="123"):
+    return Message(
+        date_raw="2024-01-01T10:00:00",
+        date_dt=None,
+        msg_type="sms",
+        direction="in",
+        attachments=[],
+        body=body,
+        sender=sender,
+        recipients="",
+        message_id="id",
+        attachment_day=None,
+    )
+
+
+def test_search_text_strips_tags_and_entities():
+    fragment = '<div class="x">\n  <b>Hello</b>   &amp; <i>World</i> &lt;/script&gt;\n</div>'
+    assert search_text(fragment) == "hello & world </script>"
+
+
+def test_thread_embeds_one_search_entry_per_message(tmp_path):
+    msgs = [make_message("Hi </script> & bye"), make_message("Second", sender="Bob")]
+    out_file = tmp_path / "out.html"
+    render_thread_html(tmp_path, out_file, msgs, ["123"], "123")
+
+    html = out_file.read_text(encoding="utf-8")
+    assert html.count("</script>") == 1
+    line = next(l for l in html.splitlines() if l.startswith("const IDX="))
+    index = json.loads(line[len("const IDX="):-1])
+    assert index == [
+        "123 hi </script> & bye 2024-01-01t10:00:00 · in · sms",
+        "bob second 2024-01-01t10:00:00 · in · sms",
+    ]
+    assert html.count('<div class="message ') == len(index)
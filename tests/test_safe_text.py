@@ -0,0 +1,17 @@
+import html
+
+import pytest
+
+from synchronoss_parser.render_transcripts import safe_text
+
+
+@pytest.mark.parametrize(
+    "raw",
+    ["", "plain text", "multi\nline", "émoji 😀", "a & b", "<b>", 'say "hi"', "it's", 12],
+)
+def test_safe_text_matches_html_escape(raw):
+    assert safe_text(raw) == html.escape(str(raw))
+
+
+def test_safe_text_none():
+    assert safe_text(None) == ""
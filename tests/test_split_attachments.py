@@ -0,0 +1,19 @@
+import pytest
+
+from synchronoss_parser.render_transcripts import split_attachments
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("", []),
+        ("a.jpg", ["a.jpg"]),
+        (" a.jpg; b.png ,c.gif|d.mp4 ", ["a.jpg", "b.png", "c.gif", "d.mp4"]),
+        ("a.jpg;; ;|b.png", ["a.jpg", "b.png"]),
+        ('["a.jpg", " b.png ", ""]', ["a.jpg", "b.png"]),
+        ('{"files": ["a.jpg"]}', ["a.jpg"]),
+        ("[not json; b.png]", ["[not json", "b.png]"]),
+    ],
+)
+def test_split_attachments(raw, expected):
+    assert split_attachments(raw) == expected